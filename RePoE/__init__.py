@@ -3,6 +3,7 @@ import os
 from typing import Dict, List, Optional
 
 from RePoE.poe_types import *
+from RePoE.snapshot import enable_snapshot_cache, disable_snapshot_cache, load_json_file
 # directory that this __init__ file lives in
 __REPOE_DIR__, _ = os.path.split(__file__)
 
@@ -12,36 +13,76 @@ __DATA_PATH__ = os.path.join(__REPOE_DIR__, "data", "")
 
 def load_json(json_file_path: str):
     file_path = __DATA_PATH__ + f"{json_file_path}"
-    with open(file_path) as json_data:
-        try:
-            return json.load(json_data)
-        except json.decoder.JSONDecodeError:
-            raise Exception(
-                f"Warning: {json_file_path} failed to decode json \n Recommended to reinstall RePoE")
-
-
-active_skill_types: List[str] = load_json("active_skill_types.min.json")
-base_items: Dict[str, BaseItem] = load_json("base_items.min.json")
-characters: List[Character] = load_json("characters.min.json")
-crafting_bench_options: List[CraftingBenchOption] = load_json(
-    "crafting_bench_options.min.json")
-default_monster_stats: Dict[str, DefaultMonsterStats] = load_json(
-    "default_monster_stats.min.json")
-essences: Dict[str, Essences] = load_json("essences.min.json")
-flavour: Dict[str, str] = load_json("flavour.min.json")
-fossils: Dict[str, Fossil] = load_json("fossils.min.json")
-gems: Dict[str, Gem] = load_json("gems.min.json")
-gem_tags: Dict[str, Optional[str]] = load_json("gem_tags.min.json")
-item_classes: Dict[str, ItemClass] = load_json("item_classes.min.json")
-mods: Dict[str, Mod] = load_json("mods.min.json")
-mod_types: Dict[str, ModTypes] = load_json("mod_types.min.json")
-stats: Dict[str, Stat] = load_json("stats.min.json")
-stat_translations: List[StatTranslation] = load_json(
-    "stat_translations.min.json")
-tags: List[str] = load_json("tags.min.json")
-cluster_jewels: Dict[str, ClusterJewel] = load_json("cluster_jewels.min.json")
-cluster_jewel_notables: List[ClusterJewelNotable] = load_json(
-    "cluster_jewel_notables.min.json")
-cost_types: Dict[str, CostType] = load_json("cost_types.min.json")
-skill_tree: SkillTree = load_json("skill_tree.min.json")
-atlas_tree: AtlasTree = load_json("atlas_tree.min.json")
+    try:
+        return load_json_file(file_path)
+    except json.decoder.JSONDecodeError:
+        raise Exception(
+            f"Warning: {json_file_path} failed to decode json \n Recommended to reinstall RePoE")
+
+
+# datasets are only loaded the first time they are accessed, see __getattr__ below
+_DATASET_FILES: Dict[str, str] = {
+    "active_skill_types": "active_skill_types.min.json",
+    "base_items": "base_items.min.json",
+    "characters": "characters.min.json",
+    "crafting_bench_options": "crafting_bench_options.min.json",
+    "default_monster_stats": "default_monster_stats.min.json",
+    "essences": "essences.min.json",
+    "flavour": "flavour.min.json",
+    "fossils": "fossils.min.json",
+    "gems": "gems.min.json",
+    "gem_tags": "gem_tags.min.json",
+    "item_classes": "item_classes.min.json",
+    "mods": "mods.min.json",
+    "mod_types": "mod_types.min.json",
+    "stats": "stats.min.json",
+    "stat_translations": "stat_translations.min.json",
+    "tags": "tags.min.json",
+    "cluster_jewels": "cluster_jewels.min.json",
+    "cluster_jewel_notables": "cluster_jewel_notables.min.json",
+    "cost_types": "cost_types.min.json",
+    "skill_tree": "skill_tree.min.json",
+    "atlas_tree": "atlas_tree.min.json",
+}
+
+active_skill_types: List[str]
+base_items: Dict[str, BaseItem]
+characters: List[Character]
+crafting_bench_options: List[CraftingBenchOption]
+default_monster_stats: Dict[str, DefaultMonsterStats]
+essences: Dict[str, Essences]
+flavour: Dict[str, str]
+fossils: Dict[str, Fossil]
+gems: Dict[str, Gem]
+gem_tags: Dict[str, Optional[str]]
+item_classes: Dict[str, ItemClass]
+mods: Dict[str, Mod]
+mod_types: Dict[str, ModTypes]
+stats: Dict[str, Stat]
+stat_translations: List[StatTranslation]
+tags: List[str]
+cluster_jewels: Dict[str, ClusterJewel]
+cluster_jewel_notables: List[ClusterJewelNotable]
+cost_types: Dict[str, CostType]
+skill_tree: SkillTree
+atlas_tree: AtlasTree
+
+# a reload (e.g. in run_parser) has to drop the datasets that were loaded before, so they are read again
+for _dataset_name in _DATASET_FILES:
+    globals().pop(_dataset_name, None)
+
+# a star import only sees the datasets that are loaded already, unless they are listed in __all__. Then it goes
+# through __getattr__ and loads them, next to the other public names it always exported
+__all__ = sorted({name for name in globals() if not name.startswith("_")} | set(_DATASET_FILES))
+
+
+def __getattr__(name: str):
+    if name in _DATASET_FILES:
+        # stored as a module global, so __getattr__ is not called again for this dataset
+        data = globals()[name] = load_json(_DATASET_FILES[name])
+        return data
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_DATASET_FILES))
@@ -0,0 +1,216 @@
+"""Monte Carlo simulation of chaos orb rerolls on a base item, built on the weights of RePoE.mods
+
+The prefix and suffix pool of the item is packed into numpy arrays once, after that rerolls are sampled in batches
+(and in a process pool for large runs). Needs numpy, which is installed with the "crafting" extra.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Collection, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("RePoE.crafting_simulator needs numpy, install it with the crafting extra (RePoE[crafting])")
+
+from RePoE.mod_pool import DEFAULT_DOMAIN, ModPool
+
+# number of affixes of a rare item and the relative chance of each
+AFFIX_COUNT_WEIGHTS: Dict[int, int] = {4: 8, 5: 3, 6: 1}
+MAX_PREFIXES = 3
+MAX_SUFFIXES = 3
+MAX_AFFIXES = MAX_PREFIXES + MAX_SUFFIXES
+
+# samples per task of the process pool, results do not depend on the number of processes as long as this is unchanged
+DEFAULT_CHUNK_SIZE = 100_000
+# draws that conflict with the mods of the item are drawn again this often, then the remaining rows are sampled exactly
+_MAX_REDRAWS = 20
+
+# the pool a draw is made from: any mod, only prefixes (suffixes are full) or only suffixes (prefixes are full)
+_ANY, _PREFIX, _SUFFIX = 0, 1, 2
+
+
+class PackedPool:
+    # the prefixes and suffixes of an item as arrays, small enough to be sent to the worker processes
+
+    def __init__(self, weights: Sequence[int], is_prefix: Sequence[bool], groups: Sequence[Collection[str]]):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.is_prefix = np.asarray(is_prefix, dtype=bool)
+        n_mods = len(self.weights)
+        # mods (by position in the pool) of every kind and the cumulative weights to draw them with
+        self.kind_mods = [
+            np.arange(n_mods),
+            np.flatnonzero(self.is_prefix),
+            np.flatnonzero(~self.is_prefix),
+        ]
+        self.cumulative_weights = [np.cumsum(self.weights[mods]) for mods in self.kind_mods]
+        self.total_weights = np.array([c[-1] if len(c) else 0.0 for c in self.cumulative_weights])
+        # conflicts[a, b] is True if a and b can not be on the same item: they share a group or are the same mod.
+        # it has an extra row and column of False for empty slots, which are -1
+        self.conflicts = np.zeros((n_mods + 1, n_mods + 1), dtype=bool)
+        mods_by_group: Dict[str, List[int]] = {}
+        for position, mod_groups in enumerate(groups):
+            for group in mod_groups:
+                mods_by_group.setdefault(group, []).append(position)
+        for positions in mods_by_group.values():
+            self.conflicts[np.ix_(positions, positions)] = True
+        self.conflicts[np.arange(n_mods), np.arange(n_mods)] = True
+
+    def _draw(self, kind: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        picked = np.empty(len(kind), dtype=np.int64)
+        for k in (_ANY, _PREFIX, _SUFFIX):
+            rows = np.flatnonzero(kind == k)
+            if len(rows):
+                draws = rng.random(len(rows)) * self.total_weights[k]
+                picked[rows] = self.kind_mods[k][np.searchsorted(self.cumulative_weights[k], draws, side="right")]
+        return picked
+
+    def _draw_exact(self, affixes: np.ndarray, row: int, step: int, kind: int, rng: np.random.Generator) -> int:
+        # draw with every conflicting mod masked out, -1 if no mod is left
+        allowed = ~self.conflicts[affixes[row, :step]].any(axis=0)[:-1]
+        if kind != _ANY:
+            allowed &= self.is_prefix if kind == _PREFIX else ~self.is_prefix
+        weights = self.weights * allowed
+        total = weights.sum()
+        if total <= 0:
+            return -1
+        return int(np.searchsorted(np.cumsum(weights), rng.random() * total, side="right"))
+
+    def sample(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """n rerolls as an (n, MAX_AFFIXES) array of mod positions in the pool, padded with -1"""
+        counts = np.array(list(AFFIX_COUNT_WEIGHTS), dtype=np.int64)
+        count_weights = np.array(list(AFFIX_COUNT_WEIGHTS.values()), dtype=np.float64)
+        n_affixes = rng.choice(counts, size=n, p=count_weights / count_weights.sum())
+        affixes = np.full((n, MAX_AFFIXES), -1, dtype=np.int64)
+        n_prefixes = np.zeros(n, dtype=np.int64)
+        n_suffixes = np.zeros(n, dtype=np.int64)
+        for step in range(MAX_AFFIXES):
+            pending = np.flatnonzero(n_affixes > step)
+            kind = np.full(len(pending), _ANY)
+            kind[n_suffixes[pending] >= MAX_SUFFIXES] = _PREFIX
+            kind[n_prefixes[pending] >= MAX_PREFIXES] = _SUFFIX
+            # a mod is drawn from the unmasked pool and drawn again if it conflicts with the mods of the item, which
+            # is the same as drawing from the pool without the conflicting mods
+            empty = self.total_weights[kind] <= 0
+            stuck_rows, stuck_kind = pending[empty], kind[empty]
+            pending, kind = pending[~empty], kind[~empty]
+            for _ in range(_MAX_REDRAWS):
+                if not len(pending):
+                    break
+                picked = self._draw(kind, rng)
+                accepted = ~self.conflicts[affixes[pending, :step], picked[:, None]].any(axis=1)
+                rows = pending[accepted]
+                affixes[rows, step] = picked[accepted]
+                prefix = self.is_prefix[picked[accepted]]
+                n_prefixes[rows] += prefix
+                n_suffixes[rows] += ~prefix
+                pending, kind = pending[~accepted], kind[~accepted]
+            # rows that kept drawing conflicting mods, usually because (almost) the whole pool conflicts
+            for row, row_kind in zip(np.concatenate([stuck_rows, pending]), np.concatenate([stuck_kind, kind])):
+                position = self._draw_exact(affixes, row, step, row_kind, rng)
+                if position < 0:
+                    # nothing can be added anymore
+                    n_affixes[row] = step
+                    continue
+                affixes[row, step] = position
+                n_prefixes[row] += self.is_prefix[position]
+                n_suffixes[row] += not self.is_prefix[position]
+        return affixes
+
+
+# pool and targets of the worker processes, set once per process by _init_worker
+_worker_state = {}
+
+
+def _init_worker(packed_pool: PackedPool, targets: Optional[np.ndarray]):
+    _worker_state["packed_pool"] = packed_pool
+    _worker_state["targets"] = targets
+
+
+def _count_hits(affixes: np.ndarray, targets: np.ndarray) -> int:
+    # targets[j, position] is True if the mod at position satisfies target j, the last column is for empty slots
+    has_target = targets[:, affixes].any(axis=2)
+    return int(has_target.all(axis=0).sum())
+
+
+def _run_chunk(n: int, seed_sequence: np.random.SeedSequence):
+    affixes = _worker_state["packed_pool"].sample(n, np.random.default_rng(seed_sequence))
+    if _worker_state["targets"] is None:
+        return affixes
+    return _count_hits(affixes, _worker_state["targets"])
+
+
+class CraftingSimulator:
+    # simulates chaos orb rerolls of a base item at an item level
+
+    def __init__(
+        self,
+        base_item_id: str,
+        item_level: int,
+        domain: str = DEFAULT_DOMAIN,
+        mod_pool: Optional[ModPool] = None,
+        extra_tags: Iterable[str] = (),
+    ):
+        if mod_pool is None:
+            mod_pool = ModPool()
+        mods = mod_pool.mods
+        weights = mod_pool.get_pool(base_item_id, domain, ("prefix", "suffix"), extra_tags)
+        # essence only mods have spawn weights, but can not be rolled by a chaos orb
+        self.mod_ids: List[str] = [
+            mod_id
+            for mod_id in weights
+            if mods[mod_id]["required_level"] <= item_level and not mods[mod_id]["is_essence_only"]
+        ]
+        self.weights: Dict[str, int] = {mod_id: weights[mod_id] for mod_id in self.mod_ids}
+        self._positions = {mod_id: position for position, mod_id in enumerate(self.mod_ids)}
+        self.packed_pool = PackedPool(
+            [weights[mod_id] for mod_id in self.mod_ids],
+            [mods[mod_id]["generation_type"] == "prefix" for mod_id in self.mod_ids],
+            [mods[mod_id]["groups"] for mod_id in self.mod_ids],
+        )
+
+    def _pack_targets(self, targets: Sequence[Iterable[str]]) -> np.ndarray:
+        packed = np.zeros((len(targets), len(self.mod_ids) + 1), dtype=bool)
+        for j, target in enumerate(targets):
+            for mod_id in target:
+                if mod_id in self._positions:
+                    packed[j, self._positions[mod_id]] = True
+        return packed
+
+    def _run(self, n: int, seed, processes: Optional[int], chunk_size: int, targets: Optional[np.ndarray]) -> list:
+        # every chunk has its own seed spawned from seed, so the results only depend on seed and chunk_size
+        sizes = [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(sizes))
+        if processes == 1 or len(sizes) <= 1:
+            _init_worker(self.packed_pool, targets)
+            try:
+                return list(map(_run_chunk, sizes, seed_sequences))
+            finally:
+                _worker_state.clear()
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(self.packed_pool, targets)) as executor:
+            return list(executor.map(_run_chunk, sizes, seed_sequences))
+
+    def sample(
+        self, n: int, seed=None, processes: Optional[int] = 1, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> np.ndarray:
+        """n rerolls as an (n, MAX_AFFIXES) array of positions in mod_ids, padded with -1.
+        processes=None uses one process per cpu"""
+        if n <= 0:
+            return np.full((0, MAX_AFFIXES), -1, dtype=np.int64)
+        return np.concatenate(self._run(n, seed, processes, chunk_size, None))
+
+    def estimate_probability(
+        self,
+        targets: Sequence[Iterable[str]],
+        n: int,
+        seed=None,
+        processes: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> float:
+        """share of n rerolls that hit every target, a target is hit if the item has any of its mod ids"""
+        if n <= 0:
+            raise ValueError(f"n should be a positive number, not {n}")
+        hits = self._run(n, seed, processes, chunk_size, self._pack_targets(targets))
+        return sum(hits) / n
+
+    def decode(self, affixes: np.ndarray) -> List[List[str]]:
+        """turns rows of sample into lists of mod ids"""
+        return [[self.mod_ids[position] for position in row if position >= 0] for row in affixes]
@@ -0,0 +1,136 @@
+"""Mod weights of a base item after fossils from RePoE.fossils are applied to it
+
+The multipliers of every fossil are computed once as a vector over the mod pool of the base, so the weights of a
+combination of fossils are the elementwise product of a few of these vectors. Needs numpy, which is installed with
+the "crafting" extra.
+"""
+from itertools import combinations
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("RePoE.fossil_weights needs numpy, install it with the crafting extra (RePoE[crafting])")
+
+import RePoE
+from RePoE.mod_pool import DEFAULT_DOMAIN, DEFAULT_GENERATION_TYPES, ModPool, get_spawn_weight
+from RePoE.poe_types import Fossil
+
+# a resonator holds at most this many fossils
+MAX_FOSSILS = 4
+
+
+class FossilWeights:
+    # weights of the mod pool of a base item under every combination of fossils that can be used on it
+
+    def __init__(
+        self,
+        base_item_id: str,
+        item_level: Optional[int] = None,
+        domain: str = DEFAULT_DOMAIN,
+        mod_pool: Optional[ModPool] = None,
+        fossils: Optional[Dict[str, Fossil]] = None,
+        extra_tags: Iterable[str] = (),
+    ):
+        # defaults to RePoE.fossils, which is only loaded once a FossilWeights is created
+        if mod_pool is None:
+            mod_pool = ModPool()
+        if fossils is None:
+            fossils = RePoE.fossils
+        mods = mod_pool.mods
+        self.tags = set(mod_pool.base_items[base_item_id]["tags"])
+        self.tags.update(extra_tags)
+        pool = mod_pool.get_pool_for_tags(self.tags, domain, DEFAULT_GENERATION_TYPES)
+
+        # fossils with allowed tags only work on items that have one of them, forbidden tags exclude items
+        self.fossil_ids: List[str] = [
+            fossil_id
+            for fossil_id, fossil in fossils.items()
+            if (not fossil["allowed_tags"] or self.tags.intersection(fossil["allowed_tags"]))
+            and not self.tags.intersection(fossil["forbidden_tags"])
+        ]
+        self._fossil_positions = {fossil_id: position for position, fossil_id in enumerate(self.fossil_ids)}
+        self._fossils = fossils
+
+        def can_roll(mod_id: str) -> bool:
+            # essence only mods have spawn weights, but can not be rolled with fossils
+            mod = mods[mod_id]
+            return (item_level is None or mod["required_level"] <= item_level) and not mod["is_essence_only"]
+
+        # the regular pool (prefixes and suffixes of the domain), followed by the mods that are only in the pool if a
+        # fossil adds them. Those have domains of their own (e.g. delve), so they only need a weight on the item
+        self.mod_ids: List[str] = [mod_id for mod_id in pool if can_roll(mod_id)]
+        weights = [pool[mod_id] for mod_id in self.mod_ids]
+        n_regular_mods = len(self.mod_ids)
+        for fossil_id in self.fossil_ids:
+            for mod_id in fossils[fossil_id]["added_mods"]:
+                if mod_id in mods and mod_id not in self.mod_ids and can_roll(mod_id):
+                    weight = get_spawn_weight(mods[mod_id], self.tags)
+                    if weight > 0:
+                        self.mod_ids.append(mod_id)
+                        weights.append(weight)
+        self._mod_positions = {mod_id: position for position, mod_id in enumerate(self.mod_ids)}
+        self.base_weights = np.array(weights, dtype=np.float64)
+
+        # multipliers[f, m] is the factor fossil f applies to the weight of mod m, every tag of the fossil that is one
+        # of the implicit_tags of the mod multiplies the weight by its value in percent
+        self.multipliers = np.ones((len(self.fossil_ids), len(self.mod_ids)))
+        # adds[f, m] is True if fossil f adds mod m to the pool, the regular mods are always in it
+        self.adds = np.zeros((len(self.fossil_ids), len(self.mod_ids)), dtype=bool)
+        self.adds[:, :n_regular_mods] = True
+        positions_by_tag: Dict[str, List[int]] = {}
+        for m, mod_id in enumerate(self.mod_ids):
+            for tag in set(mods[mod_id]["implicit_tags"]):
+                positions_by_tag.setdefault(tag, []).append(m)
+        for f, fossil_id in enumerate(self.fossil_ids):
+            fossil = fossils[fossil_id]
+            for weight in fossil["positive_mod_weights"] + fossil["negative_mod_weights"]:
+                positions = positions_by_tag.get(weight["tag"])
+                if positions:
+                    self.multipliers[f, positions] *= weight["weight"] / 100
+            for mod_id in fossil["added_mods"]:
+                if mod_id in self._mod_positions:
+                    self.adds[f, self._mod_positions[mod_id]] = True
+
+    def _get_positions(self, fossil_ids: Sequence[str]) -> List[int]:
+        if not 1 <= len(fossil_ids) <= MAX_FOSSILS:
+            raise ValueError(f"between 1 and {MAX_FOSSILS} fossils can be used at once, not {len(fossil_ids)}")
+        if len(set(fossil_ids)) != len(fossil_ids):
+            raise ValueError(f"a fossil can only be used once at a time: {fossil_ids}")
+        for fossil_id in fossil_ids:
+            if fossil_id not in self._fossil_positions:
+                raise ValueError(f"{fossil_id} can not be used on an item with the tags {sorted(self.tags)}")
+        return [self._fossil_positions[fossil_id] for fossil_id in fossil_ids]
+
+    def get_weights(self, fossil_ids: Sequence[str]) -> np.ndarray:
+        """weight of every mod in mod_ids with the fossils applied, 0 for mods that can not spawn"""
+        positions = self._get_positions(fossil_ids)
+        multiplier = self.multipliers[positions].prod(axis=0)
+        # an added mod is only in the pool if one of the fossils adds it
+        in_pool = self.adds[positions].any(axis=0)
+        return self.base_weights * multiplier * in_pool
+
+    def get_weight_dict(self, fossil_ids: Sequence[str]) -> Dict[str, float]:
+        """mod id -> weight of the mods that can spawn with the fossils"""
+        weights = self.get_weights(fossil_ids)
+        return {self.mod_ids[position]: float(weights[position]) for position in np.flatnonzero(weights)}
+
+    def get_forced_mods(self, fossil_ids: Sequence[str]) -> List[str]:
+        """mods that the fossils always add to the item, in addition to the ones rolled from the weights"""
+        self._get_positions(fossil_ids)
+        forced_mods = []
+        for fossil_id in fossil_ids:
+            for mod_id in self._fossils[fossil_id]["forced_mods"]:
+                if mod_id not in forced_mods:
+                    forced_mods.append(mod_id)
+        return forced_mods
+
+    def iter_combinations(
+        self, max_fossils: int = MAX_FOSSILS, fossil_ids: Optional[Sequence[str]] = None
+    ) -> Iterator[Tuple[Tuple[str, ...], np.ndarray]]:
+        """yields every combination of 1 to max_fossils of the fossils (all usable ones by default) and its weights"""
+        if fossil_ids is None:
+            fossil_ids = self.fossil_ids
+        for n_fossils in range(1, min(max_fossils, MAX_FOSSILS) + 1):
+            for combination in combinations(fossil_ids, n_fossils):
+                yield combination, self.get_weights(combination)
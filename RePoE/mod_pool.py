@@ -0,0 +1,212 @@
+"""Computes which mods of RePoE.mods can spawn on a base item and with which weight
+
+The mods are indexed by the tags of their spawn weights, separately for every (domain, generation type), so a pool
+is built from the few index entries of the item's tags instead of a scan over all mods.
+
+Only one mod of a group can be on an item. Groups are numbered, so the groups of a mod are an int with one bit per
+group and a set of mods is an int with one bit per mod (its position in ModPool.mod_ids). Which mods of a pool are
+still allowed on an item is then pool_mask & ~blocked_mask.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import RePoE
+from RePoE.poe_types import BaseItem, Mod, Weight
+
+# domain and generation types of the regular prefixes and suffixes of items
+DEFAULT_DOMAIN = "item"
+DEFAULT_GENERATION_TYPES = ("prefix", "suffix")
+
+
+def _get_weight(weights: List[Weight], tags: Iterable[str]) -> Optional[int]:
+    # the first weight whose tag the item has decides, None if the item has none of them
+    tags = set(tags)
+    for weight in weights:
+        if weight["tag"] in tags:
+            return weight["weight"]
+    return None
+
+
+def get_spawn_weight(mod: Mod, tags: Iterable[str]) -> int:
+    """weight of mod on an item with the given tags, its spawn weight multiplied by its generation weight in percent.
+    This is the unindexed version of ModPool.get_pool for a single mod"""
+    tags = set(tags)
+    weight = _get_weight(mod["spawn_weights"], tags) or 0
+    multiplier = _get_weight(mod["generation_weights"], tags)
+    if multiplier is not None:
+        weight = weight * multiplier // 100
+    return weight
+
+
+class _Bucket:
+    # index of the mods of one (domain, generation type)
+
+    def __init__(self):
+        # tag -> (mod position, position of the tag in spawn_weights, weight) of every mod that has a weight for the tag
+        self.spawn_index: Dict[str, List[Tuple[int, int, int]]] = {}
+        # tag -> (mod position, position of the tag in generation_weights, weight)
+        self.generation_index: Dict[str, List[Tuple[int, int, int]]] = {}
+
+    @staticmethod
+    def _add(index: Dict[str, List[Tuple[int, int, int]]], mod_position: int, weights: List[Weight]):
+        for position, weight in enumerate(weights):
+            index.setdefault(weight["tag"], []).append((mod_position, position, weight["weight"]))
+
+    def add(self, mod_position: int, mod: Mod):
+        spawn_weights = mod["spawn_weights"]
+        # zero weights at the end can only make the mod not spawn, which is also the result if no tag matches
+        end = len(spawn_weights)
+        while end and spawn_weights[end - 1]["weight"] == 0:
+            end -= 1
+        if end == 0:
+            # the mod never spawns
+            return
+        self._add(self.spawn_index, mod_position, spawn_weights[:end])
+        self._add(self.generation_index, mod_position, mod["generation_weights"])
+
+    @staticmethod
+    def _first_matches(index: Dict[str, List[Tuple[int, int, int]]], tags: Iterable[str]) -> Dict[int, int]:
+        # mod position -> weight of the first of its weights that has one of the tags
+        first: Dict[int, Tuple[int, int]] = {}
+        for tag in tags:
+            for mod_position, position, weight in index.get(tag, ()):
+                current = first.get(mod_position)
+                if current is None or position < current[0]:
+                    first[mod_position] = (position, weight)
+        return {mod_position: weight for mod_position, (_, weight) in first.items()}
+
+    def get_weights(self, tags: Iterable[str]) -> Dict[int, int]:
+        weights = {}
+        multipliers = self._first_matches(self.generation_index, tags)
+        for mod_position, weight in self._first_matches(self.spawn_index, tags).items():
+            if mod_position in multipliers:
+                weight = weight * multipliers[mod_position] // 100
+            if weight > 0:
+                weights[mod_position] = weight
+        return weights
+
+
+class ModPool:
+    # index of the spawn weights of mods, answers which mods can spawn on a base item
+
+    def __init__(self, mods: Optional[Dict[str, Mod]] = None, base_items: Optional[Dict[str, BaseItem]] = None):
+        # defaults to RePoE.mods and RePoE.base_items, which are only loaded once a ModPool is created
+        if mods is None:
+            mods = RePoE.mods
+        self._base_items = base_items
+        self.mod_ids: List[str] = list(mods)
+        self.mods = mods
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        # group -> its bit in the group masks
+        self.group_bits: Dict[str, int] = {}
+        # group mask of every mod, by position in mod_ids
+        self.group_masks: List[int] = []
+        group_members: List[List[int]] = []
+        for mod_position, mod in enumerate(mods.values()):
+            key = (mod["domain"], mod["generation_type"])
+            if key not in self._buckets:
+                self._buckets[key] = _Bucket()
+            self._buckets[key].add(mod_position, mod)
+            group_mask = 0
+            for group in mod["groups"]:
+                if group not in self.group_bits:
+                    self.group_bits[group] = 1 << len(self.group_bits)
+                    group_members.append([])
+                group_mask |= self.group_bits[group]
+                group_members[self.group_bits[group].bit_length() - 1].append(mod_position)
+            self.group_masks.append(group_mask)
+        # mod mask of the members of every group, by the position of its bit
+        self._group_member_masks: List[int] = [self.get_mod_mask_of_positions(m) for m in group_members]
+        self._mod_positions: Dict[str, int] = {mod_id: position for position, mod_id in enumerate(self.mod_ids)}
+        # pools are cached per tag set, as most base items share their tags with other bases
+        self._pool_cache: Dict[Tuple[frozenset, str, Tuple[str, ...]], Dict[str, int]] = {}
+
+    @property
+    def base_items(self) -> Dict[str, BaseItem]:
+        if self._base_items is None:
+            self._base_items = RePoE.base_items
+        return self._base_items
+
+    def get_pool_for_tags(
+        self,
+        tags: Iterable[str],
+        domain: str = DEFAULT_DOMAIN,
+        generation_types: Sequence[str] = DEFAULT_GENERATION_TYPES,
+    ) -> Dict[str, int]:
+        """mod id -> weight of every mod of the domain and generation types that can spawn on an item with the tags.
+        The mods are in the order of RePoE.mods"""
+        key = (frozenset(tags), domain, tuple(generation_types))
+        if key not in self._pool_cache:
+            weights = {}
+            for generation_type in generation_types:
+                bucket = self._buckets.get((domain, generation_type))
+                if bucket is not None:
+                    weights.update(bucket.get_weights(key[0]))
+            self._pool_cache[key] = {self.mod_ids[position]: weights[position] for position in sorted(weights)}
+        # a copy, so callers can change the pool they get
+        return dict(self._pool_cache[key])
+
+    def get_pool(
+        self,
+        base_item_id: str,
+        domain: str = DEFAULT_DOMAIN,
+        generation_types: Sequence[str] = DEFAULT_GENERATION_TYPES,
+        extra_tags: Iterable[str] = (),
+    ) -> Dict[str, int]:
+        """mod id -> weight of every mod that can spawn on the base item (a key of RePoE.base_items).
+        extra_tags are added to the tags of the base, e.g. the adds_tags of the mods the item already has"""
+        tags = set(self.base_items[base_item_id]["tags"])
+        tags.update(extra_tags)
+        return self.get_pool_for_tags(tags, domain, generation_types)
+
+    @staticmethod
+    def get_mod_mask_of_positions(positions: Iterable[int]) -> int:
+        mask = 0
+        for position in positions:
+            mask |= 1 << position
+        return mask
+
+    def get_mod_mask(self, mod_ids: Iterable[str]) -> int:
+        """mod mask of the mods, e.g. of a pool from get_pool"""
+        return self.get_mod_mask_of_positions(self._mod_positions[mod_id] for mod_id in mod_ids)
+
+    def get_mod_ids(self, mod_mask: int) -> List[str]:
+        """the mods of a mod mask, in the order of RePoE.mods"""
+        mod_ids = []
+        while mod_mask:
+            lowest_bit = mod_mask & -mod_mask
+            mod_ids.append(self.mod_ids[lowest_bit.bit_length() - 1])
+            mod_mask ^= lowest_bit
+        return mod_ids
+
+    def get_group_mask(self, mod_ids: Iterable[str]) -> int:
+        """group mask of all groups of the mods, e.g. of the mods on an item"""
+        group_mask = 0
+        for mod_id in mod_ids:
+            group_mask |= self.group_masks[self._mod_positions[mod_id]]
+        return group_mask
+
+    def conflicts(self, mod_id: str, group_mask: int) -> bool:
+        """whether the mod shares a group with the groups of group_mask"""
+        return self.group_masks[self._mod_positions[mod_id]] & group_mask != 0
+
+    def get_blocked_mask(self, group_mask: int) -> int:
+        """mod mask of every mod that shares a group with the groups of group_mask"""
+        blocked_mask = 0
+        while group_mask:
+            lowest_bit = group_mask & -group_mask
+            blocked_mask |= self._group_member_masks[lowest_bit.bit_length() - 1]
+            group_mask ^= lowest_bit
+        return blocked_mask
+
+    def get_allowed_mask(self, pool_mask: int, item_mod_ids: Iterable[str]) -> int:
+        """mod mask of the mods of pool_mask that can still be added to an item with the given mods"""
+        item_mod_ids = list(item_mod_ids)
+        # a mod can not be added twice, even if it has no groups
+        blocked_mask = self.get_blocked_mask(self.get_group_mask(item_mod_ids)) | self.get_mod_mask(item_mod_ids)
+        return pool_mask & ~blocked_mask
+
+
+if __name__ == "__main__":
+    pool = ModPool()
+    for mod_id, weight in pool.get_pool("Metadata/Items/Rings/Ring1").items():
+        print(mod_id, weight)
@@ -0,0 +1,104 @@
+"""Tiers of the mods in RePoE.mods
+
+Mods of the same type, groups, domain and generation type are tiers of each other. Each ladder is sorted by
+required_level and stat ranges, tier 1 being the best. Tiers depend on the base item, as not every tier can spawn on
+every base, so the ladder of a base only contains the mods of its mod pool (see mod_pool.py). Essence only mods and
+mods without a positive spawn weight are not in any ladder, as they never roll.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from RePoE.mod_pool import ModPool
+from RePoE.poe_types import Mod
+
+# highest item level, lookups for higher item levels are answered for this one
+MAX_ITEM_LEVEL = 100
+
+LadderKey = Tuple[str, Tuple[str, ...], str, str]
+
+
+def get_ladder_key(mod: Mod) -> LadderKey:
+    return mod["type"], tuple(sorted(mod["groups"])), mod["domain"], mod["generation_type"]
+
+
+def can_roll(mod: Mod) -> bool:
+    return not mod["is_essence_only"] and any(weight["weight"] > 0 for weight in mod["spawn_weights"])
+
+
+def _get_sort_key(mod: Mod):
+    # higher level mods are better, mods of the same level are compared by their stat ranges
+    return mod["required_level"], [(stat["max"], stat["min"]) for stat in mod["stats"]]
+
+
+class Ladder:
+    # the tiers of one ladder, best first
+
+    def __init__(self, mod_ids: List[str], mods: Dict[str, Mod]):
+        self.mod_ids = mod_ids
+        self.tiers: Dict[str, int] = {mod_id: tier for tier, mod_id in enumerate(mod_ids, 1)}
+        # best_by_level[item_level] is the best mod that can spawn at item_level, None if no tier can.
+        # the ladder is sorted by required level first, so that is the first mod that does not require more
+        self.best_by_level: List[Optional[str]] = [None] * (MAX_ITEM_LEVEL + 1)
+        position = 0
+        for item_level in range(MAX_ITEM_LEVEL, -1, -1):
+            while position < len(mod_ids) and mods[mod_ids[position]]["required_level"] > item_level:
+                position += 1
+            if position < len(mod_ids):
+                self.best_by_level[item_level] = mod_ids[position]
+
+    def get_best(self, item_level: int) -> Optional[str]:
+        return self.best_by_level[max(0, min(item_level, MAX_ITEM_LEVEL))]
+
+
+class ModTiers:
+    # index of the tier ladders of RePoE.mods, in general and for single base items
+
+    def __init__(self, mod_pool: Optional[ModPool] = None):
+        # defaults to a ModPool of RePoE.mods and RePoE.base_items
+        if mod_pool is None:
+            mod_pool = ModPool()
+        self.mod_pool = mod_pool
+        mods = mod_pool.mods
+        self._ladder_keys: Dict[str, LadderKey] = {}
+        mod_ids_by_key: Dict[LadderKey, List[str]] = {}
+        for mod_id, mod in mods.items():
+            key = get_ladder_key(mod)
+            self._ladder_keys[mod_id] = key
+            if can_roll(mod):
+                mod_ids_by_key.setdefault(key, []).append(mod_id)
+        self.ladders: Dict[LadderKey, Ladder] = {
+            key: Ladder(sorted(mod_ids, key=lambda mod_id: _get_sort_key(mods[mod_id]), reverse=True), mods)
+            for key, mod_ids in mod_ids_by_key.items()
+        }
+        # ladder of the keys that have no mod that can roll
+        self._empty_ladder = Ladder([], mods)
+        # ladders of single bases, built on their first lookup
+        self._base_ladders: Dict[Tuple[str, LadderKey], Ladder] = {}
+
+    def get_ladder(self, mod_id: str, base_item_id: Optional[str] = None) -> Ladder:
+        """the ladder of the mod, only with the tiers that can spawn on the base if one is given. The mod itself is not
+        in it if it can not roll"""
+        key = self._ladder_keys[mod_id]
+        ladder = self.ladders.get(key, self._empty_ladder)
+        if base_item_id is None:
+            return ladder
+        if (base_item_id, key) not in self._base_ladders:
+            _, _, domain, generation_type = key
+            pool = self.mod_pool.get_pool(base_item_id, domain, (generation_type,))
+            mod_ids = [ladder_mod_id for ladder_mod_id in ladder.mod_ids if ladder_mod_id in pool]
+            self._base_ladders[(base_item_id, key)] = Ladder(mod_ids, self.mod_pool.mods)
+        return self._base_ladders[(base_item_id, key)]
+
+    def get_tier(self, mod_id: str, base_item_id: Optional[str] = None) -> Optional[int]:
+        """tier of the mod (1 is the best), on the base if one is given. None if the mod can not roll (on the base)"""
+        return self.get_ladder(mod_id, base_item_id).tiers.get(mod_id)
+
+    def get_best_tier(
+        self, mod_id: str, item_level: int, base_item_id: Optional[str] = None
+    ) -> Tuple[Optional[int], Optional[str]]:
+        """tier and id of the best mod of the ladder of mod_id that can spawn at item_level (on the base if one is
+        given), (None, None) if no tier can"""
+        ladder = self.get_ladder(mod_id, base_item_id)
+        best = ladder.get_best(item_level)
+        if best is None:
+            return None, None
+        return ladder.tiers[best], best
@@ -1,7 +1,33 @@
+from typing import List
+
+from RePoE.parser.instrumentation import CountingRelationalReader, measure
 from RePoE.parser.util import write_json
 
 
 class Parser_Module:
+    # the .dat64 tables (in Data/) and other game files the module reads. run_parser hashes them to skip modules
+    # whose inputs did not change since the last run, so tables that are only reached through a foreign key column
+    # have to be listed as well
+    dat_files: List[str] = []
+    game_files: List[str] = []
+
+    @classmethod
+    def get_input_files(cls, file_system) -> List[str]:
+        """ paths of all game files the module reads, override this if they can only be determined at runtime"""
+        return ["Data/" + dat_file for dat_file in cls.dat_files] + cls.game_files
+
+    @classmethod
+    def get_local_input_files(cls) -> List[str]:
+        """ paths of files on disk (outside of the game files) the module reads, e.g. files that come with PyPoE"""
+        return []
+
+    @classmethod
+    def run(cls, measurements, relational_reader, **kwargs):
+        """ calls write, appends its measurements (including the rows it reads) to measurements"""
+        counting_reader = CountingRelationalReader(relational_reader)
+        with measure(cls.__name__, measurements, counting_reader):
+            cls.write(relational_reader=counting_reader, **kwargs)
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         """ method which writes json files to data_path"""
@@ -0,0 +1,72 @@
+"""Times Parser_Module.write of every parser module against a synthetic game install, see synthetic.py
+
+python -m RePoE.parser.benchmark [--rows N] [--gem-levels N] [--repeat N] [--report PATH] [module ...]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+from typing import List
+
+from RePoE.parser.instrumentation import print_summary
+from RePoE.parser.modules import get_parser_modules
+from RePoE.parser.synthetic import create_synthetic_game
+
+
+def run_benchmark(parser_modules, rows=1000, gem_levels=20, repeat=3, seed=0) -> List[dict]:
+    """runs every module repeat times, returns the fastest run of each module"""
+    game = create_synthetic_game(rows=rows, gem_levels=gem_levels, seed=seed)
+    # generating the tables would otherwise be measured as part of the first module that reads them
+    game["relational_reader"].build_all()
+
+    best = {}
+    for _ in range(repeat):
+        # every run writes to an empty folder, unchanged files would not be written again otherwise
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_path = os.path.join(tmp_dir, "")
+            os.makedirs(os.path.join(tmp_dir, "stat_translations"))
+            for parser_module in parser_modules:
+                measurements = []
+                with contextlib.redirect_stdout(io.StringIO()):
+                    parser_module.run(measurements, data_path=data_path, **game)
+                measurement = measurements[0]
+                name = measurement["name"]
+                if name not in best or measurement["wall_time"] < best[name]["wall_time"]:
+                    best[name] = measurement
+    return [best[parser_module.__name__] for parser_module in parser_modules]
+
+
+def main():
+    modules = get_parser_modules()
+    module_names = [module.__name__ for module in modules]
+    parser = argparse.ArgumentParser(description="Benchmark the parser modules on generated data")
+    parser.add_argument(
+        "module_names",
+        metavar="module",
+        nargs="*",
+        help="the modules to benchmark, all if none are given (choose from '" + "', '".join(module_names) + "')",
+    )
+    parser.add_argument("--rows", type=int, default=1000, help="number of rows of the large tables")
+    parser.add_argument("--gem-levels", type=int, default=20, help="number of levels of every gem")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs, the fastest one is reported")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated data")
+    parser.add_argument("--report", help="path of a json file to write the results to")
+    args = parser.parse_args()
+    # argparse rejects an empty list if choices are set, so the names are checked here
+    unknown_names = set(args.module_names) - set(module_names)
+    if unknown_names:
+        parser.error("unknown modules: " + ", ".join(sorted(unknown_names)))
+
+    selected_modules = [m for m in modules if not args.module_names or m.__name__ in args.module_names]
+    print(f"Benchmarking {len(selected_modules)} modules with {args.rows} rows ...", flush=True)
+    measurements = run_benchmark(selected_modules, args.rows, args.gem_levels, args.repeat, args.seed)
+    print_summary(measurements)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"rows": args.rows, "gem_levels": args.gem_levels, "steps": measurements}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
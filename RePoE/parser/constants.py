@@ -123,3 +123,12 @@ STAT_DESCRIPTION_NAMING_EXCEPTIONS = {
     "gem_stat_descriptions.txt": "/support_gem",
     "map_stat_descriptions.txt": "/areas",
 }
+
+# Most stat description files include stat_descriptions.txt, the skill stat description files also include
+# skill_stat_descriptions.txt. Files in the stat_translations folder are written as overlays on top of whichever of
+# these tables they share the most translations with, instead of repeating all of the included translations.
+# The first one is written to stat_translations/_base.
+STAT_DESCRIPTION_OVERLAY_BASES = [
+    "stat_descriptions.txt",
+    "skill_stat_descriptions.txt",
+]
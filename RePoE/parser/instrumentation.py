@@ -0,0 +1,86 @@
+"""Wall time, CPU time, peak memory and row counts of the steps of a parser run, see run_parser --report"""
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # not available on windows, memory is not measured there
+    resource = None
+
+REPORT_FILE_NAME = "parser_report.json"
+
+
+def _get_peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes everywhere else
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def _count_rows(table) -> Optional[int]:
+    try:
+        return len(table)
+    except TypeError:
+        return getattr(table, "table_rows", None)
+
+
+class CountingRelationalReader:
+    """wraps a RelationalReader and counts the rows of every table that is read through it"""
+
+    def __init__(self, relational_reader):
+        self._relational_reader = relational_reader
+        self.rows_read: Dict[str, int] = {}
+
+    def __getitem__(self, file_name):
+        table = self._relational_reader[file_name]
+        rows = _count_rows(table)
+        if rows is not None:
+            self.rows_read[file_name] = self.rows_read.get(file_name, 0) + rows
+        return table
+
+    def __getattr__(self, name):
+        return getattr(self._relational_reader, name)
+
+    def __setattr__(self, name, value):
+        # attributes like the index cache of parser.util belong to the wrapped reader, so modules keep sharing them
+        if name in ("_relational_reader", "rows_read"):
+            super().__setattr__(name, value)
+        else:
+            setattr(self._relational_reader, name, value)
+
+
+@contextmanager
+def measure(name: str, measurements: List[dict], relational_reader: Optional[CountingRelationalReader] = None):
+    """measures the wrapped block and appends the result to measurements, even if the block raises"""
+    measurement = {"name": name}
+    peak_rss_before = _get_peak_rss_kb()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield measurement
+    finally:
+        measurement["wall_time"] = time.perf_counter() - wall_start
+        measurement["cpu_time"] = time.process_time() - cpu_start
+        peak_rss_after = _get_peak_rss_kb()
+        # the peak only grows, so this is how much the step raised it
+        measurement["peak_rss_delta_kb"] = None if peak_rss_before is None else peak_rss_after - peak_rss_before
+        measurement["rows_read"] = {} if relational_reader is None else dict(relational_reader.rows_read)
+        measurements.append(measurement)
+
+
+def print_summary(measurements: List[dict]):
+    print(f"{'Step':<32}{'Wall (s)':>10}{'CPU (s)':>10}{'Peak RSS +MB':>14}{'Rows read':>12}")
+    for m in measurements:
+        rss = "-" if m["peak_rss_delta_kb"] is None else f"{m['peak_rss_delta_kb'] / 1024:.1f}"
+        rows = sum(m["rows_read"].values())
+        print(f"{m['name']:<32}{m['wall_time']:>10.2f}{m['cpu_time']:>10.2f}{rss:>14}{rows:>12}")
+
+
+def write_report(measurements: List[dict], data_path: str):
+    with open(data_path + REPORT_FILE_NAME, "w") as f:
+        json.dump({"steps": measurements}, f, indent=2, sort_keys=True)
@@ -14,7 +14,8 @@ def _get_child_classes(module, parent_class):
 
 
 def get_all_modules():
-    file_names = glob.glob(join(dirname(__file__), "*.py"))
+    # sorted, so modules are always run in the same order
+    file_names = sorted(glob.glob(join(dirname(__file__), "*.py")))
     module_strings = [basename(f)[:-3] for f in file_names if isfile(f) and not f.endswith("__init__.py")]
     return [importlib.import_module(f"RePoE.parser.modules.{module_string}") for module_string in module_strings]
 
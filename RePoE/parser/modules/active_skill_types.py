@@ -3,6 +3,8 @@ from RePoE.parser import Parser_Module
 
 
 class active_skill_types(Parser_Module):
+    dat_files = ["ActiveSkillType.dat64"]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         types = [row["Id"] for row in relational_reader["ActiveSkillType.dat64"]]
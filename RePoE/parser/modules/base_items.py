@@ -1,12 +1,9 @@
-from collections import defaultdict
-
 from RePoE.parser import Parser_Module
-from RePoE.parser.util import write_json, call_with_default_args, get_release_state
+from RePoE.parser.util import write_json, call_with_default_args, get_release_state, index_by
 
 
-def _create_default_dict(relation):
-    d = {row["BaseItemTypesKey"]["Id"]: row for row in relation if row["BaseItemTypesKey"] is not None}
-    return defaultdict(lambda: None, d)
+def _index_by_base_item(relational_reader, file_name):
+    return index_by(relational_reader, file_name, ("BaseItemTypesKey", "Id"))
 
 
 def _add_if_greater_zero(value, key, obj):
@@ -190,15 +187,32 @@ ITEM_CLASS_BLACKLIST = {
 
 
 class base_items(Parser_Module):
+    dat_files = [
+        "BaseItemTypes.dat64",
+        "ItemClasses.dat64",
+        "ItemVisualIdentity.dat64",
+        "Tags.dat64",
+        "Mods.dat64",
+        "ComponentAttributeRequirements.dat64",
+        "ArmourTypes.dat64",
+        "ShieldTypes.dat64",
+        "Flasks.dat64",
+        "BuffDefinitions.dat64",
+        "Stats.dat64",
+        "ComponentCharges.dat64",
+        "WeaponTypes.dat64",
+        "CurrencyItems.dat64",
+    ]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
-        attribute_requirements = _create_default_dict(relational_reader["ComponentAttributeRequirements.dat64"])
-        armour_types = _create_default_dict(relational_reader["ArmourTypes.dat64"])
-        shield_types = _create_default_dict(relational_reader["ShieldTypes.dat64"])
-        flask_types = _create_default_dict(relational_reader["Flasks.dat64"])
-        flask_charges = _create_default_dict(relational_reader["ComponentCharges.dat64"])
-        weapon_types = _create_default_dict(relational_reader["WeaponTypes.dat64"])
-        currency_type = _create_default_dict(relational_reader["CurrencyItems.dat64"])
+        attribute_requirements = _index_by_base_item(relational_reader, "ComponentAttributeRequirements.dat64")
+        armour_types = _index_by_base_item(relational_reader, "ArmourTypes.dat64")
+        shield_types = _index_by_base_item(relational_reader, "ShieldTypes.dat64")
+        flask_types = _index_by_base_item(relational_reader, "Flasks.dat64")
+        flask_charges = _index_by_base_item(relational_reader, "ComponentCharges.dat64")
+        weapon_types = _index_by_base_item(relational_reader, "WeaponTypes.dat64")
+        currency_type = _index_by_base_item(relational_reader, "CurrencyItems.dat64")
         # Not covered here: SkillGems.dat (see gems.py), Essences.dat (see essences.py)
 
         root = {}
@@ -218,12 +232,12 @@ class base_items(Parser_Module):
             inherited_tags = []
             item_id = item["Id"]
             properties = {}
-            _convert_armour_properties(armour_types[item_id], properties)
-            _convert_shield_properties(shield_types[item_id], properties)
-            _convert_flask_properties(flask_types[item_id], properties)
-            _convert_flask_charge_properties(flask_charges[item_id], properties)
-            _convert_weapon_properties(weapon_types[item_id], properties)
-            _convert_currency_properties(currency_type[item_id], properties)
+            _convert_armour_properties(armour_types.get(item_id), properties)
+            _convert_shield_properties(shield_types.get(item_id), properties)
+            _convert_flask_properties(flask_types.get(item_id), properties)
+            _convert_flask_charge_properties(flask_charges.get(item_id), properties)
+            _convert_weapon_properties(weapon_types.get(item_id), properties)
+            _convert_currency_properties(currency_type.get(item_id), properties)
             root[item_id] = {
                 "name": item["Name"],
                 "item_class": item["ItemClassesKey"]["Id"],
@@ -236,12 +250,12 @@ class base_items(Parser_Module):
                     "id": item["ItemVisualIdentityKey"]["Id"],
                     "dds_file": item["ItemVisualIdentityKey"]["DDSFile"],
                 },
-                "requirements": _convert_requirements(attribute_requirements[item_id], item["DropLevel"]),
+                "requirements": _convert_requirements(attribute_requirements.get(item_id), item["DropLevel"]),
                 "properties": properties,
                 "release_state": get_release_state(item_id).name,
                 #"domain": item["ModDomainsKey"].name.lower(),
             }
-            _convert_flask_buff(flask_types[item_id], root[item_id])
+            _convert_flask_buff(flask_types.get(item_id), root[item_id])
 
         print(f"Skipped the following item classes for base_items {skipped_item_classes}")
         write_json(root, data_path, "base_items")
@@ -3,6 +3,8 @@ from RePoE.parser import Parser_Module
 
 
 class cluster_jewel_notables(Parser_Module):
+    dat_files = ["PassiveTreeExpansionSpecialSkills.dat64", "PassiveSkills.dat64", "Stats.dat64"]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         data = []
@@ -3,6 +3,16 @@ from RePoE.parser import Parser_Module
 
 
 class cluster_jewels(Parser_Module):
+    dat_files = [
+        "PassiveTreeExpansionSkills.dat64",
+        "PassiveTreeExpansionJewels.dat64",
+        "PassiveTreeExpansionJewelSizes.dat64",
+        "PassiveSkills.dat64",
+        "Stats.dat64",
+        "Tags.dat64",
+        "BaseItemTypes.dat64",
+    ]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         skills = {}
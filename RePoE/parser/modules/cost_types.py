@@ -3,6 +3,8 @@ from RePoE.parser import Parser_Module
 
 
 class cost_types(Parser_Module):
+    dat_files = ["CostTypes.dat64", "Stats.dat64"]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         root = {}
@@ -17,6 +17,16 @@ class CraftingBenchCustomActions(IntEnumOverride):
 
 
 class crafting_bench_options(Parser_Module):
+    dat_files = [
+        "CraftingBenchOptions.dat64",
+        "CraftingItemClassCategories.dat64",
+        "ItemClasses.dat64",
+        "HideoutNPCs.dat64",
+        "NPCs.dat64",
+        "BaseItemTypes.dat64",
+        "Mods.dat64",
+    ]
+
     @staticmethod
     def _get_actions(row):
         actions = {}
@@ -3,6 +3,8 @@ from RePoE.parser.util import write_json, call_with_default_args
 
 
 class default_monster_stats(Parser_Module):
+    dat_files = ["DefaultMonsterStats.dat64"]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         root = {}
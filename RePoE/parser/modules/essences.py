@@ -38,6 +38,8 @@ def get_essence_min_drop_level(row):
 
 
 class essences(Parser_Module):
+    dat_files = ["Essences.dat64", "EssenceType.dat64", "BaseItemTypes.dat64", "Mods.dat64"]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         essences = {
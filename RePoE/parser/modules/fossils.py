@@ -3,6 +3,15 @@ from RePoE.parser.util import write_json, call_with_default_args
 
 
 class fossils(Parser_Module):
+    dat_files = [
+        "DelveCraftingModifiers.dat64",
+        "DelveCraftingTags.dat64",
+        "DelveCraftingModifierDescriptions.dat64",
+        "BaseItemTypes.dat64",
+        "Mods.dat64",
+        "Tags.dat64",
+    ]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         root = {}
@@ -1,4 +1,5 @@
 import re
+from operator import itemgetter
 
 from PyPoE.poe.constants import IntEnumOverride
 from PyPoE.poe.file.stat_filters import StatFilterFile
@@ -8,6 +9,8 @@ from RePoE.parser.util import (
     write_json,
     get_release_state,
     get_stat_translation_file_name,
+    group_by,
+    where,
 )
 from RePoE.parser import Parser_Module
 
@@ -19,30 +22,62 @@ class CooldownBypassTypes(IntEnumOverride):
     NONE = 4
 
 
+def _get_static(value):
+    # the static part of a value that is the same on all levels, as _handle_dict and _handle_list would build it
+    if isinstance(value, dict):
+        static = {}
+        for k, v in value.items():
+            static_value = _get_static(v)
+            if static_value is not None:
+                static[k] = static_value
+        return static or None
+    if isinstance(value, list):
+        if not value:
+            return []
+        static = [_get_static(v) for v in value]
+        return static if any(v is not None for v in static) else None
+    return value
+
+
+def _handle_column(representative, column):
+    # column holds the value of one key (or list index) on every level. Constant columns are detected with a single
+    # comparison of the whole values, only containers that differ between levels are split up further
+    if column.count(representative) == len(column):
+        return _get_static(representative), True
+    if isinstance(representative, dict):
+        return _handle_dict(representative, column)
+    if isinstance(representative, list):
+        return _handle_list(representative, column)
+    return None, False
+
+
+def _get_column(k, per_level):
+    # the value of k on every level, or None if a level misses it
+    try:
+        return list(map(itemgetter(k), per_level))
+    except (KeyError, IndexError, TypeError):
+        pass
+    # checked one level after another, so a level that is not a dict only fails if no earlier level misses k
+    column = []
+    for pl in per_level:
+        if k not in pl:
+            return None
+        column.append(pl[k])
+    return column
+
+
 def _handle_dict(representative, per_level):
+    per_level = list(per_level)
     static = None
     cleared = True
     cleared_keys = []
     for k, v in representative.items():
-        per_level_values = []
-        skip = False
-        for pl in per_level:
-            if k not in pl:
-                skip = True
-                break
-            per_level_values.append(pl[k])
-        if skip:
+        column = _get_column(k, per_level)
+        if column is None:
             cleared = False
             continue
 
-        if isinstance(v, dict):
-            static_value, cleared_value = _handle_dict(v, per_level_values)
-        elif isinstance(v, list):
-            static_value, cleared_value = _handle_list(v, per_level_values)
-        else:
-            static_value, cleared_value = _handle_primitives(
-                v, per_level_values)
-
+        static_value, cleared_value = _handle_column(v, column)
         if static_value is not None:
             if static is None:
                 static = {}
@@ -53,8 +88,8 @@ def _handle_dict(representative, per_level):
         else:
             cleared = False
 
-    for k in cleared_keys:
-        for pl in per_level:
+    for pl in per_level:
+        for k in cleared_keys:
             del pl[k]
     return static, cleared
 
@@ -80,15 +115,7 @@ def _handle_list(representative, per_level):
     cleared = True
     cleared_is = []
     for i, v in enumerate(representative):
-        per_level_values = [pl[i] for pl in per_level]
-        if isinstance(v, dict):
-            static_value, cleared_value = _handle_dict(v, per_level_values)
-        elif isinstance(v, list):
-            static_value, cleared_value = _handle_list(v, per_level_values)
-        else:
-            static_value, cleared_value = _handle_primitives(
-                v, per_level_values)
-
+        static_value, cleared_value = _handle_column(v, [pl[i] for pl in per_level])
         if static_value is not None:
             if static is None:
                 static = [None] * len(representative)
@@ -105,39 +132,17 @@ def _handle_list(representative, per_level):
     return static, cleared
 
 
-def _handle_primitives(representative, per_level):
-    for pl in per_level:
-        if pl != representative:
-            return None, False
-    return representative, True
-
-
 class GemConverter:
     regex_number = re.compile(r"-?\d+(\.\d+)?")
 
     def __init__(self, file_system, relational_reader):
         self.relational_reader = relational_reader
 
-        self.gepls = {}
-        for gepl in self.relational_reader["GrantedEffectsPerLevel.dat64"]:
-            ge_id = gepl["GrantedEffect"]["Id"]
-            if ge_id not in self.gepls:
-                self.gepls[ge_id] = []
-            self.gepls[ge_id].append(gepl)
-
-        self.gesspls = {}
-        for gesspl in self.relational_reader["GrantedEffectStatSetsPerLevel.dat64"]:
-            gess_id = gesspl["StatSet"]["Id"]
-            if gess_id not in self.gesspls:
-                self.gesspls[gess_id] = []
-            self.gesspls[gess_id].append(gesspl)
-
-        self.granted_effect_quality_stats = {}
-        for geq in self.relational_reader["GrantedEffectQualityStats.dat64"]:
-            ge_id = geq["GrantedEffectsKey"]["Id"]
-            if ge_id not in self.granted_effect_quality_stats:
-                self.granted_effect_quality_stats[ge_id] = []
-            self.granted_effect_quality_stats[ge_id].append(geq)
+        self.gepls = group_by(relational_reader, "GrantedEffectsPerLevel.dat64", ("GrantedEffect", "Id"))
+        self.gesspls = group_by(relational_reader, "GrantedEffectStatSetsPerLevel.dat64", ("StatSet", "Id"))
+        self.granted_effect_quality_stats = group_by(
+            relational_reader, "GrantedEffectQualityStats.dat64", ("GrantedEffectsKey", "Id")
+        )
 
         self.tags = {}
         for tag in self.relational_reader["GemTags.dat64"]:
@@ -326,8 +331,8 @@ class GemConverter:
             obj["secondary_granted_effect"] = secondary_granted_effect["Id"]
 
         # GrantedEffectsPerLevel
-        gepls = self.gepls[granted_effect["Id"]]
-        gepls.sort(key=lambda g: g["Level"])
+        # the groups are shared with other modules, so they are not sorted in place
+        gepls = sorted(self.gepls[granted_effect["Id"]], key=lambda g: g["Level"])
         gess = granted_effect["StatSet"]
         gesspls = {row["GemLevel"]: row for row in self.gesspls[gess["Id"]]}
         gepls_dict = {}
@@ -399,6 +404,27 @@ class GemConverter:
 
 
 class gems(Parser_Module):
+    dat_files = [
+        "SkillGems.dat64",
+        "GemEffects.dat64",
+        "GemTags.dat64",
+        "GrantedEffects.dat64",
+        "GrantedEffectsPerLevel.dat64",
+        "GrantedEffectStatSets.dat64",
+        "GrantedEffectStatSetsPerLevel.dat64",
+        "GrantedEffectQualityStats.dat64",
+        "ActiveSkills.dat64",
+        "ActiveSkillType.dat64",
+        "SkillTotemVariations.dat64",
+        "MonsterVarieties.dat64",
+        "ItemClasses.dat64",
+        "CostTypes.dat64",
+        "Stats.dat64",
+        "BaseItemTypes.dat64",
+        "Mods.dat64",
+    ]
+    game_files = ["Metadata/StatDescriptions/skillpopup_stat_filters.txt"]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, **kwargs):
         gems = {}
@@ -428,9 +454,7 @@ class gems(Parser_Module):
                 None, granted_effect, None, None, None)
 
         # Skills from mods
-        for mod in relational_reader["Mods.dat64"]:
-            if mod["GrantedEffectsPerLevelKeys"] is None:
-                continue
+        for mod in where(relational_reader, "Mods.dat64", ("GrantedEffectsPerLevelKeys",)):
             for granted_effect_per_level in mod["GrantedEffectsPerLevelKeys"]:
                 granted_effect = granted_effect_per_level["GrantedEffect"]
                 ge_id = granted_effect["Id"]
@@ -3,6 +3,8 @@ from RePoE.parser import Parser_Module
 
 
 class item_classes(Parser_Module):
+    dat_files = ["ItemClasses.dat64"]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         item_classes = {row["Id"]: {"name": row["Name"],} for row in relational_reader["ItemClasses.dat64"]}
@@ -54,6 +54,16 @@ def _convert_tags_keys(tags_keys):
 
 
 class mods(Parser_Module):
+    dat_files = [
+        "Mods.dat64",
+        "ModType.dat64",
+        "ModFamily.dat64",
+        "Stats.dat64",
+        "Tags.dat64",
+        "GrantedEffectsPerLevel.dat64",
+        "GrantedEffects.dat64",
+    ]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         root = {}
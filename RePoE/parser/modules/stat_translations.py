@@ -1,7 +1,26 @@
+import contextlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPoE
 from PyPoE.poe.file.translations import get_custom_translation_file
+from RePoE.parser.constants import STAT_DESCRIPTION_OVERLAY_BASES
 from RePoE.parser.util import write_json, call_with_default_args, get_stat_translation_file_name
 from RePoE.parser import Parser_Module
 
+STAT_TRANSLATION_FOLDER = "stat_translations/"
+SHARED_BASE_NAME = "_base"
+STAT_DESCRIPTION_PATH = "Metadata/StatDescriptions/"
+# translations that PyPoE adds to every description file, see get_custom_translation_file
+CUSTOM_TRANSLATION_FILE_NAME = "custom_descriptions.txt"
+
+# number of processes that convert the description files, None for one per cpu. The processes are forked, so they
+# share the translation file cache and the converted custom translations with the parent, only 1 process is used if
+# forking is not available
+PROCESSES = None
+
 
 def _convert_tags(n_ids, tags, tags_types):
     f = ["ignore" for _ in range(n_ids)]
@@ -60,6 +79,17 @@ def _convert(tr, tag_set):
     return {"ids": ids, "English": english}
 
 
+def _convert_custom_translations(custom_translations):
+    # converted once and shared by all files, with the tags of each translation so they are only counted if used
+    converted = []
+    for tr in custom_translations:
+        tags = set()
+        result = _convert(tr, tags)
+        result["hidden"] = True
+        converted.append((" ".join(tr.ids), result, tags))
+    return converted
+
+
 def _get_stat_translations(tag_set, translations, custom_translations):
     previous = set()
     root = []
@@ -70,17 +100,42 @@ def _get_stat_translations(tag_set, translations, custom_translations):
             continue
         previous.add(id_str)
         root.append(_convert(tr, tag_set))
-    for tr in custom_translations:
-        id_str = " ".join(tr.ids)
+    for id_str, result, tags in custom_translations:
         if id_str in previous:
             continue
         previous.add(id_str)
-        result = _convert(tr, tag_set)
-        result["hidden"] = True
+        tag_set.update(tags)
         root.append(result)
     return root
 
 
+# translation file cache and converted custom translations, set while the files are converted
+_worker_state = {}
+
+
+def _convert_file(in_file):
+    # output is collected and returned, so it is printed in file order
+    tag_set = set()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        translations = _worker_state["translation_file_cache"][in_file].translations
+        result = _get_stat_translations(tag_set, translations, _worker_state["custom_translations"])
+    return result, tag_set, output.getvalue()
+
+
+def _convert_files(in_files, translation_file_cache, custom_translations):
+    processes = min(PROCESSES or os.cpu_count() or 1, len(in_files))
+    _worker_state["translation_file_cache"] = translation_file_cache
+    _worker_state["custom_translations"] = custom_translations
+    try:
+        if processes <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+            return list(map(_convert_file, in_files))
+        with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("fork")) as executor:
+            return list(executor.map(_convert_file, in_files))
+    finally:
+        _worker_state.clear()
+
+
 def _build_stat_translation_file_map(file_system):
     node = file_system.build_directory()
     for game_file in node["Metadata"]["StatDescriptions"].children.keys():
@@ -89,14 +144,77 @@ def _build_stat_translation_file_map(file_system):
             yield game_file, out_file
 
 
+def _build_overlay(translations, base_name, base):
+    # entries are either translations or [start, stop] slices of the base table that are taken over unchanged
+    base_positions = {tuple(tr["ids"]): i for i, tr in enumerate(base)}
+    entries = []
+    current_slice = None
+    for tr in translations:
+        position = base_positions.get(tuple(tr["ids"]))
+        if position is not None and base[position] == tr:
+            if current_slice is not None and current_slice[1] == position:
+                current_slice[1] += 1
+            else:
+                current_slice = [position, position + 1]
+                entries.append(current_slice)
+        else:
+            current_slice = None
+            entries.append(tr)
+    return {"base": base_name, "entries": entries}
+
+
+def _write_stat_translation_files(results, data_path):
+    # results maps (in_file, out_file) to the full translation table of each description file
+    tables = {in_file: result for (in_file, _), result in results.items()}
+    shared_base = tables.get(STAT_DESCRIPTION_OVERLAY_BASES[0])
+    if shared_base is not None:
+        write_json(shared_base, data_path, STAT_TRANSLATION_FOLDER + SHARED_BASE_NAME)
+
+    # base files come first, so the files after them can be written as overlays on top of them
+    bases = {}
+    if shared_base is not None:
+        bases[SHARED_BASE_NAME] = shared_base
+    ordered = sorted(
+        results.items(),
+        key=lambda item: STAT_DESCRIPTION_OVERLAY_BASES.index(item[0][0])
+        if item[0][0] in STAT_DESCRIPTION_OVERLAY_BASES
+        else len(STAT_DESCRIPTION_OVERLAY_BASES),
+    )
+    for (in_file, out_file), result in ordered:
+        if not bases or not out_file.startswith(STAT_TRANSLATION_FOLDER):
+            write_json(result, data_path, out_file)
+            continue
+        overlays = [_build_overlay(result, base_name, base) for base_name, base in bases.items()]
+        overlay = min(overlays, key=lambda o: sum(1 for entry in o["entries"] if isinstance(entry, dict)))
+        write_json(overlay, data_path, out_file)
+        if in_file in STAT_DESCRIPTION_OVERLAY_BASES:
+            bases[out_file[len(STAT_TRANSLATION_FOLDER) :]] = result
+
+
 class stat_translations(Parser_Module):
+    @classmethod
+    def get_input_files(cls, file_system):
+        # description files include each other, so every file in the folder is an input
+        node = file_system.build_directory()
+        return [STAT_DESCRIPTION_PATH + game_file for game_file in node["Metadata"]["StatDescriptions"].children.keys()]
+
+    @classmethod
+    def get_local_input_files(cls):
+        data_dir = getattr(PyPoE, "DATA_DIR", None) or os.path.join(os.path.dirname(PyPoE.__file__), "_data")
+        return [os.path.join(data_dir, CUSTOM_TRANSLATION_FILE_NAME)]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         tag_set = set()
-        for in_file, out_file in _build_stat_translation_file_map(file_system):
-            translations = translation_file_cache[in_file].translations
-            result = _get_stat_translations(tag_set, translations, get_custom_translation_file().translations)
-            write_json(result, data_path, out_file)
+        results = {}
+        file_map = list(_build_stat_translation_file_map(file_system))
+        custom_translations = _convert_custom_translations(get_custom_translation_file().translations)
+        converted = _convert_files([in_file for in_file, _ in file_map], translation_file_cache, custom_translations)
+        for (in_file, out_file), (result, file_tag_set, output) in zip(file_map, converted):
+            print(output, end="")
+            tag_set.update(file_tag_set)
+            results[(in_file, out_file)] = result
+        _write_stat_translation_files(results, data_path)
         print("Possible format tags: {}".format(tag_set))
 
 
@@ -12,6 +12,8 @@ def _convert_alias_stats(alias_stats_key_1, alias_stats_key_2):
 
 
 class stats(Parser_Module):
+    dat_files = ["Stats.dat64"]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         root = {}
@@ -3,6 +3,8 @@ from RePoE.parser import Parser_Module
 
 
 class tags(Parser_Module):
+    dat_files = ["Tags.dat64"]
+
     @staticmethod
     def write(file_system, data_path, relational_reader, translation_file_cache, ot_file_cache):
         tags = [row["Id"] for row in relational_reader["Tags.dat64"]]
@@ -0,0 +1,689 @@
+"""Generated stand-ins for the file system and readers that are passed to Parser_Module.write
+
+The tables have the fields the parser modules read, filled with random but internally consistent rows, so every
+module can run without a game install (PyPoE itself is still required). They are meant for measuring the parser
+(see benchmark.py), the generated json files have no meaning.
+"""
+import itertools
+import random
+from typing import Dict, List, Optional
+
+from PyPoE.poe.constants import MOD_DOMAIN, MOD_GENERATION_TYPE
+
+from RePoE.parser.modules.base_items import ITEM_CLASS_WHITELIST
+
+SKILL_POPUP_STAT_FILTERS = "Metadata/StatDescriptions/skillpopup_stat_filters.txt"
+STAT_DESCRIPTION_PATH = "Metadata/StatDescriptions/"
+
+# tables with a fixed number of rows, like enums in the game files
+_FIXED_TABLE_ROWS = {
+    "ActiveSkillType.dat64": 120,
+    "Characters.dat64": 7,
+    "CostTypes.dat64": 6,
+    "DefaultMonsterStats.dat64": 100,
+    "DelveCraftingTags.dat64": 30,
+    "EssenceType.dat64": 8,
+    "GemTags.dat64": 60,
+    "HideoutNPCs.dat64": 8,
+    "ItemClasses.dat64": len(ITEM_CLASS_WHITELIST),
+    "ModFamily.dat64": 400,
+    "ModSellPriceTypes.dat64": 10,
+    "ModType.dat64": 300,
+    "NPCs.dat64": 8,
+    "PassiveTreeExpansionJewelSizes.dat64": 3,
+    # every cluster jewel lists all passive skills of its size
+    "PassiveTreeExpansionJewels.dat64": 3,
+    "Tags.dat64": 300,
+}
+
+_TAG_TYPES = ["", "d", "+d", "+"]
+_INDEX_HANDLERS = ["negate", "per_minute_to_per_second", "milliseconds_to_seconds", "divide_by_one_hundred"]
+
+
+class SyntheticRow(dict):
+    """a row of a synthetic table, indexed by field name like PyPoE's DatRecord"""
+
+    def iter(self):
+        for key, value in self.items():
+            yield key, value, None
+
+
+class SyntheticRelationalReader:
+    """serves generated rows for every table the parser modules read
+
+    rows is the number of rows of the large tables (Mods, BaseItemTypes, Stats, GrantedEffects, ...), table_rows
+    overrides it for single tables. Every gem gets gem_levels rows in the per level tables. Tables are generated on
+    first access, build_all generates all of them up front.
+    """
+
+    def __init__(
+        self, rows: int = 1000, gem_levels: int = 20, seed: int = 0, table_rows: Optional[Dict[str, int]] = None
+    ):
+        self.rows = rows
+        self.gem_levels = gem_levels
+        self.seed = seed
+        self.table_rows = table_rows or {}
+        self._tables: Dict[str, List[SyntheticRow]] = {}
+
+    def __getitem__(self, file_name) -> List[SyntheticRow]:
+        if file_name not in self._tables:
+            builder = getattr(self, "_build_" + file_name[: -len(".dat64")], None)
+            if builder is None:
+                raise KeyError(f"No synthetic table for {file_name}")
+            # every table has its own generator, so its rows don't depend on the order tables are accessed in
+            rng = random.Random(f"{self.seed}:{file_name}")
+            # the table is registered before it is filled, so rows can reference earlier rows of the same table
+            table = self._tables[file_name] = []
+            for i in range(self.get_row_count(file_name)):
+                table.append(SyntheticRow(builder(i, rng)))
+        return self._tables[file_name]
+
+    def has_table(self, file_name) -> bool:
+        return hasattr(self, "_build_" + file_name[: -len(".dat64")])
+
+    def build_all(self):
+        for name in dir(self):
+            if name.startswith("_build_"):
+                self[name[len("_build_") :] + ".dat64"]
+
+    def get_row_count(self, file_name) -> int:
+        if file_name in self.table_rows:
+            return self.table_rows[file_name]
+        if file_name in ("GrantedEffectsPerLevel.dat64", "GrantedEffectStatSetsPerLevel.dat64"):
+            return self.get_row_count("GrantedEffects.dat64") * self.gem_levels
+        if file_name in ("GrantedEffectStatSets.dat64", "SkillGems.dat64", "GemEffects.dat64"):
+            return self.get_row_count("GrantedEffects.dat64")
+        return _FIXED_TABLE_ROWS.get(file_name, self.rows)
+
+    def _row(self, file_name, i):
+        table = self[file_name]
+        return table[i % len(table)]
+
+    def _rows(self, file_name, rng, max_count):
+        table = self[file_name]
+        return [table[rng.randrange(len(table))] for _ in range(rng.randint(0, max_count))]
+
+    def _optional_row(self, file_name, rng, chance=0.5):
+        return self._row(file_name, rng.randrange(1 << 30)) if rng.random() < chance else None
+
+    # tables that only have an id
+
+    def _build_ActiveSkillType(self, i, rng):
+        return {"Id": f"SkillType{i}"}
+
+    def _build_Tags(self, i, rng):
+        return {"Id": f"tag_{i}"}
+
+    def _build_ModFamily(self, i, rng):
+        return {"Id": f"ModFamily{i}"}
+
+    def _build_ModSellPriceTypes(self, i, rng):
+        return {"Id": f"SellPriceType{i}"}
+
+    def _build_ItemClasses(self, i, rng):
+        item_class = sorted(ITEM_CLASS_WHITELIST)[i % len(ITEM_CLASS_WHITELIST)]
+        return {"Id": item_class, "Name": item_class}
+
+    def _build_GemTags(self, i, rng):
+        return {"Id": f"gem_tag_{i}", "Tag": "" if i % 10 == 0 else f"GemTag{i}"}
+
+    def _build_CostTypes(self, i, rng):
+        return {"Id": f"CostType{i}", "StatsKey": self._optional_row("Stats.dat64", rng), "FormatText": "{0} Cost"}
+
+    def _build_Characters(self, i, rng):
+        return {
+            "Id": f"Metadata/Characters/Character{i}",
+            "IntegerId": i,
+            "Name": f"Character{i}",
+            "BaseMaxLife": 50,
+            "BaseMaxMana": 40,
+            "BaseStrength": rng.randint(7, 32),
+            "BaseDexterity": rng.randint(7, 32),
+            "BaseIntelligence": rng.randint(7, 32),
+            "WeaponSpeed": 1200,
+            "MinDamage": 2,
+            "MaxDamage": 6,
+            "MaxAttackDistance": 4,
+        }
+
+    def _build_DefaultMonsterStats(self, i, rng):
+        return {
+            "DisplayLevel": str(i + 1),
+            "Damage": rng.uniform(1, 5000),
+            "Evasion": rng.randint(0, 50000),
+            "Accuracy": rng.randint(0, 50000),
+            "Life": rng.randint(0, 500000),
+            "AllyLife": rng.randint(0, 500000),
+            "Armour": rng.randint(0, 50000),
+        }
+
+    def _build_FlavourText(self, i, rng):
+        return {"Id": f"FlavourText{i}", "Text": f"Flavour text number {i}"}
+
+    # stats and mods
+
+    def _build_Stats(self, i, rng):
+        return {
+            "Id": f"synthetic_stat_{i}",
+            "IsLocal": rng.random() < 0.2,
+            "IsWeaponLocal": rng.random() < 0.05,
+            "MainHandAlias_StatsKey": self._row("Stats.dat64", rng.randrange(i)) if i and rng.random() < 0.05 else None,
+            "OffHandAlias_StatsKey": None,
+        }
+
+    def _build_ModType(self, i, rng):
+        return {"Name": f"ModType{i}", "ModSellPriceTypesKeys": self._rows("ModSellPriceTypes.dat64", rng, 2)}
+
+    def _build_Mods(self, i, rng):
+        stats = []
+        for _ in range(5):
+            if rng.random() < 0.4:
+                low = rng.randint(-20, 100)
+                stats.append([self._row("Stats.dat64", rng.randrange(1 << 30)), low, low + rng.randint(0, 50)])
+            else:
+                stats.append([None, 0, 0])
+        granted_effects = None
+        if rng.random() < 0.02:
+            effect = rng.randrange(self.get_row_count("GrantedEffects.dat64"))
+            granted_effects = [self._row("GrantedEffectsPerLevel.dat64", effect * self.gem_levels)]
+        return {
+            "Id": f"SyntheticMod{i}",
+            "Level": rng.randint(1, 86),
+            "Stats": stats,
+            "Domain": rng.choice(list(MOD_DOMAIN)),
+            "Name": f"of Mod {i}" if i % 2 else f"Mod {i}'s",
+            "ModTypeKey": self._row("ModType.dat64", rng.randrange(1 << 30)),
+            "GenerationType": rng.choice(list(MOD_GENERATION_TYPE)),
+            "Families": self._rows("ModFamily.dat64", rng, 2),
+            "SpawnWeight": [(tag, rng.choice([0, 100, 1000])) for tag in self._rows("Tags.dat64", rng, 5)],
+            "GenerationWeight": [(tag, rng.choice([50, 200])) for tag in self._rows("Tags.dat64", rng, 1)],
+            "GrantedEffectsPerLevelKeys": granted_effects,
+            "IsEssenceOnlyModifier": int(rng.random() < 0.05),
+            "TagsKeys": self._rows("Tags.dat64", rng, 2),
+            "ImplicitTagsKeys": self._rows("Tags.dat64", rng, 3),
+        }
+
+    # base items
+
+    def _build_ItemVisualIdentity(self, i, rng):
+        return {"Id": f"VisualIdentity{i}", "DDSFile": f"Art/2DItems/Synthetic{i}.dds"}
+
+    def _build_BaseItemTypes(self, i, rng):
+        return {
+            "Id": f"Metadata/Items/Synthetic/Item{i}",
+            "Name": f"Synthetic Item {i}",
+            "ItemClassesKey": self._row("ItemClasses.dat64", i),
+            "Width": rng.randint(1, 2),
+            "Height": rng.randint(1, 4),
+            "DropLevel": rng.randint(1, 85),
+            "Implicit_ModsKeys": self._rows("Mods.dat64", rng, 2),
+            "TagsKeys": self._rows("Tags.dat64", rng, 4),
+            "ItemVisualIdentityKey": self._row("ItemVisualIdentity.dat64", i),
+            "InheritsFrom": "Metadata/Items/Item",
+        }
+
+    def _base_item_component(self, i, rng):
+        # component tables have at most one row per base item, some rows are not attached to any base item
+        return {"BaseItemTypesKey": self._row("BaseItemTypes.dat64", i) if rng.random() < 0.9 else None}
+
+    def _build_ComponentAttributeRequirements(self, i, rng):
+        row = self._base_item_component(i, rng)
+        row.update({"ReqStr": rng.randint(0, 200), "ReqDex": rng.randint(0, 200), "ReqInt": rng.randint(0, 200)})
+        return row
+
+    def _build_ArmourTypes(self, i, rng):
+        row = self._base_item_component(i, rng)
+        for name in ("Armour", "Evasion", "EnergyShield"):
+            low = rng.choice([0, rng.randint(1, 500)])
+            row[name + "Min"] = low
+            row[name + "Max"] = low + rng.randint(0, 50)
+        row["IncreasedMovementSpeed"] = rng.choice([0, 0, -3, 5])
+        return row
+
+    def _build_ShieldTypes(self, i, rng):
+        row = self._base_item_component(i, rng)
+        row["Block"] = rng.randint(20, 30)
+        return row
+
+    def _build_BuffDefinitions(self, i, rng):
+        return {"Id": f"synthetic_buff_{i}", "StatsKeys": self._rows("Stats.dat64", rng, 3)}
+
+    def _build_Flasks(self, i, rng):
+        row = self._base_item_component(i, rng)
+        buff = self._optional_row("BuffDefinitions.dat64", rng, 0.3)
+        row.update(
+            {
+                "LifePerUse": rng.choice([0, rng.randint(50, 2000)]),
+                "ManaPerUse": rng.choice([0, rng.randint(50, 500)]),
+                "RecoveryTime": rng.randint(0, 100),
+                "BuffDefinitionsKey": buff,
+                "BuffStatValues": [] if buff is None else [rng.randint(1, 50) for _ in buff["StatsKeys"]],
+            }
+        )
+        return row
+
+    def _build_ComponentCharges(self, i, rng):
+        row = self._base_item_component(i, rng)
+        row.update({"MaxCharges": rng.randint(20, 60), "PerCharge": rng.randint(5, 30)})
+        return row
+
+    def _build_WeaponTypes(self, i, rng):
+        row = self._base_item_component(i, rng)
+        low = rng.randint(1, 100)
+        row.update(
+            {
+                "Critical": rng.randint(500, 900),
+                "Speed": rng.randint(600, 1500),
+                "DamageMin": low,
+                "DamageMax": low + rng.randint(1, 100),
+                "RangeMax": rng.randint(4, 120),
+            }
+        )
+        return row
+
+    def _build_CurrencyItems(self, i, rng):
+        row = self._base_item_component(i, rng)
+        row.update(
+            {
+                "Stacks": rng.choice([1, 10, 20, 40]),
+                "Directions": f"Right click on item {i}",
+                "FullStack_BaseItemTypesKey": self._optional_row("BaseItemTypes.dat64", rng, 0.05),
+                "Description": f"Synthetic currency {i}",
+                "CurrencyTab_StackSize": rng.choice([0, 5000]),
+            }
+        )
+        return row
+
+    # gems
+
+    def _build_ActiveSkills(self, i, rng):
+        return {
+            "Id": f"synthetic_skill_{i}",
+            "DisplayedName": f"Synthetic Skill {i}",
+            "Description": f"Description of synthetic skill {i}",
+            "ActiveSkillTypes": self._rows("ActiveSkillType.dat64", rng, 6),
+            "WeaponRestriction_ItemClassesKeys": self._rows("ItemClasses.dat64", rng, 2),
+            "IsManuallyCasted": rng.random() < 0.5,
+            "Input_StatKeys": [],
+            "Output_StatKeys": [],
+            # ids past the end of SkillTotemVariations are not totems
+            "SkillTotemId": rng.randrange(self.get_row_count("SkillTotemVariations.dat64") * 10),
+            "MinionActiveSkillTypes": self._rows("ActiveSkillType.dat64", rng, 2) if rng.random() < 0.1 else [],
+        }
+
+    def _build_MonsterVarieties(self, i, rng):
+        return {"Id": f"Metadata/Monsters/Synthetic{i}", "LifeMultiplier": rng.randint(50, 200)}
+
+    def _build_SkillTotemVariations(self, i, rng):
+        return {"SkillTotemsKey": i, "MonsterVarietiesKey": self._row("MonsterVarieties.dat64", i)}
+
+    def _build_GrantedEffects(self, i, rng):
+        is_support = i % 3 == 0
+        return {
+            # the gems module looks this one up by id
+            "Id": "PlayerMelee" if i == 1 else f"SyntheticEffect{i}",
+            "IsSupport": is_support,
+            "SupportGemLetter": "S" if is_support else "",
+            "SupportsGemsOnly": False,
+            "AllowedActiveSkillTypes": self._rows("ActiveSkillType.dat64", rng, 3),
+            "ExcludedActiveSkillTypes": self._rows("ActiveSkillType.dat64", rng, 2),
+            "AddedActiveSkillTypes": self._rows("ActiveSkillType.dat64", rng, 1),
+            "CastTime": rng.choice([0, 500, 750, 1000]),
+            "ActiveSkill": None if is_support else self._row("ActiveSkills.dat64", i),
+            "StatSet": self._row("GrantedEffectStatSets.dat64", i),
+        }
+
+    def _build_GrantedEffectStatSets(self, i, rng):
+        constant_stats = self._rows("Stats.dat64", rng, 6)
+        return {
+            "Id": f"SyntheticStatSet{i}",
+            "ConstantStats": constant_stats,
+            "ConstantStatsValues": [rng.randint(1, 100) for _ in constant_stats],
+            "ImplicitStats": self._rows("Stats.dat64", rng, 3),
+        }
+
+    def _build_GrantedEffectsPerLevel(self, i, rng):
+        effect, level = divmod(i, self.gem_levels)
+        cost_types = self._rows("CostTypes.dat64", rng, 1)
+        return {
+            "GrantedEffect": self._row("GrantedEffects.dat64", effect),
+            "Level": level + 1,
+            "PlayerLevelReq": min(level * 4 + 1, 100),
+            "Cooldown": 0 if effect % 4 else 4000,
+            "CooldownBypassType": 4 if effect % 8 else 1,
+            "StoredUses": 0 if effect % 4 else 1,
+            "CostMultiplier": 100 + level * 5,
+            "CostTypes": cost_types,
+            "CostAmounts": [level + 5 for _ in cost_types],
+            "AttackSpeedMultiplier": 0 if effect % 2 else -10,
+            "VaalSouls": 0,
+            "VaalStoredUses": 0,
+            "ManaReservationFlat": 0,
+            "ManaReservationPercent": 0 if effect % 5 else 5000,
+            "LifeReservationFlat": 0,
+            "LifeReservationPercent": 0,
+        }
+
+    def _build_GrantedEffectStatSetsPerLevel(self, i, rng):
+        effect, level = divmod(i, self.gem_levels)
+        # the same stats on every level of an effect, about half of them scale with the level
+        effect_rng = random.Random(f"{self.seed}:stat_set:{effect}")
+        float_stats = self._rows("Stats.dat64", effect_rng, 6)
+        additional_stats = self._rows("Stats.dat64", effect_rng, 4)
+        scaling = [effect_rng.random() < 0.5 for _ in float_stats + additional_stats]
+        base_values = [effect_rng.randint(1, 100) for _ in float_stats + additional_stats]
+        values = [base + level * 3 if scales else base for base, scales in zip(base_values, scaling)]
+        return {
+            "StatSet": self._row("GrantedEffectStatSets.dat64", effect),
+            "GemLevel": level + 1,
+            "DamageEffectiveness": 0 if effect % 2 else 100 + level * 2,
+            "BaseMultiplier": 0 if effect % 2 else level * 10,
+            "SpellCritChance": 0 if effect % 3 else 600,
+            "FloatStats": float_stats,
+            "BaseResolvedValues": values[: len(float_stats)],
+            "AdditionalStats": additional_stats,
+            "AdditionalStatsValues": values[len(float_stats) :],
+            "AdditionalFlags": self._rows("Stats.dat64", effect_rng, 2),
+            "GrantedEffects": [self._row("GrantedEffects.dat64", effect)],
+        }
+
+    def _build_GrantedEffectQualityStats(self, i, rng):
+        stats = self._rows("Stats.dat64", rng, 2)
+        return {
+            "GrantedEffectsKey": self._row("GrantedEffects.dat64", i),
+            "StatsKeys": stats,
+            "StatsValuesPermille": [rng.randint(100, 2000) for _ in stats],
+        }
+
+    def _build_GemEffects(self, i, rng):
+        return {
+            "GrantedEffect": self._row("GrantedEffects.dat64", i),
+            "GrantedEffect2": self._row("GrantedEffects.dat64", i + 1) if i % 50 == 0 else None,
+            "GemTags": self._rows("GemTags.dat64", rng, 4),
+        }
+
+    def _build_SkillGems(self, i, rng):
+        multipliers = rng.choice([(100, 0, 0), (60, 40, 0), (0, 0, 100), (0, 50, 50), (0, 0, 0)])
+        return {
+            "BaseItemTypesKey": self._row("BaseItemTypes.dat64", i),
+            "GemEffects": [self._row("GemEffects.dat64", i)],
+            "Str": multipliers[0],
+            "Dex": multipliers[1],
+            "Int": multipliers[2],
+        }
+
+    # smaller modules
+
+    def _build_PassiveTreeExpansionJewelSizes(self, i, rng):
+        return {"Name": ["Small", "Medium", "Large"][i % 3]}
+
+    def _build_PassiveSkills(self, i, rng):
+        stats = self._rows("Stats.dat64", rng, 4)
+        row = {"Id": f"synthetic_passive_{i}", "Name": f"Synthetic Passive {i}", "Stats": stats}
+        for n in range(len(stats)):
+            row[f"Stat{n + 1}Value"] = rng.randint(1, 50)
+        return row
+
+    def _build_PassiveTreeExpansionSkills(self, i, rng):
+        return {
+            "PassiveTreeExpansionJewelSizesKey": self._row("PassiveTreeExpansionJewelSizes.dat64", i),
+            "PassiveSkillsKey": self._row("PassiveSkills.dat64", i),
+            "TagsKey": self._row("Tags.dat64", i),
+        }
+
+    def _build_PassiveTreeExpansionJewels(self, i, rng):
+        return {
+            "PassiveTreeExpansionJewelSizesKey": self._row("PassiveTreeExpansionJewelSizes.dat64", i),
+            "BaseItemTypesKey": self._row("BaseItemTypes.dat64", i),
+            "MinNodes": 2,
+            "MaxNodes": 12,
+            "SmallIndices": [0, 4, 6, 8],
+            "NotableIndices": [6, 10, 2],
+            "SocketIndices": [6],
+            "TotalIndices": 12,
+        }
+
+    def _build_PassiveTreeExpansionSpecialSkills(self, i, rng):
+        return {"PassiveSkillsKey": self._row("PassiveSkills.dat64", i), "StatsKey": self._row("Stats.dat64", i)}
+
+    def _build_NPCs(self, i, rng):
+        return {"Name": f"Synthetic Master {i}"}
+
+    def _build_HideoutNPCs(self, i, rng):
+        return {"Hideout_NPCsKey": self._row("NPCs.dat64", i)}
+
+    def _build_CraftingItemClassCategories(self, i, rng):
+        return {"ItemClasses": self._rows("ItemClasses.dat64", rng, 5)}
+
+    def _build_CraftingBenchOptions(self, i, rng):
+        return {
+            "Name": f"Synthetic Crafting Option {i}",
+            "RequiredLevel": rng.choice([1, 50, 200]),
+            "IsDisabled": rng.random() < 0.05,
+            "CraftingItemClassCategories": self._rows("CraftingItemClassCategories.dat64", rng, 2),
+            "HideoutNPCsKey": self._row("HideoutNPCs.dat64", i),
+            "Tier": rng.randint(1, 3),
+            "Cost": [(base_item, rng.randint(1, 20)) for base_item in self._rows("BaseItemTypes.dat64", rng, 2)],
+            # every option needs at least one action
+            "AddMod": self._row("Mods.dat64", i),
+            "AddEnchantment": self._optional_row("Mods.dat64", rng, 0.1),
+            "Links": rng.choice([0, 0, 4]),
+            "SocketColours": "",
+            "Sockets": 0,
+            "CraftingBenchCustomAction": 0,
+        }
+
+    def _build_EssenceType(self, i, rng):
+        return {"EssenceType": i + 1, "IsCorruptedEssence": i >= 6}
+
+    def _build_Essences(self, i, rng):
+        row = {
+            "BaseItemTypesKey": self._row("BaseItemTypes.dat64", i),
+            "DropLevel": [rng.randint(1, 80)] if rng.random() < 0.9 else [],
+            "Level": rng.randint(1, 8),
+            "ItemLevelRestriction": rng.choice([0, 0, 45, 60]),
+            "EssenceTypeKey": self._row("EssenceType.dat64", i),
+        }
+        for key in (
+            "Amulet_ModsKey",
+            "Belt_ModsKey",
+            "BodyArmour_ModsKey",
+            "Boots_ModsKey",
+            "Bow_ModsKey",
+            "Claw_ModsKey",
+            "Dagger_ModsKey",
+            "Gloves_ModsKey",
+            "Helmet_ModsKey",
+            "OneHandAxe_ModsKey",
+            "OneHandMace_ModsKey",
+            "OneHandSword_ModsKey",
+            "Display_Quiver_ModsKey",
+            "Ring_ModsKey",
+            "Sceptre_ModsKey",
+            "Shield_ModsKey",
+            "Staff_ModsKey",
+            "OneHandThrustingSword_ModsKey",
+            "TwoHandAxe_ModsKey",
+            "TwoHandMace_ModsKey",
+            "TwoHandSword_ModsKey",
+            "Wand_ModsKey",
+        ):
+            row[key] = self._optional_row("Mods.dat64", rng, 0.8)
+        return row
+
+    def _build_DelveCraftingTags(self, i, rng):
+        return {"TagsKey": self._row("Tags.dat64", i)}
+
+    def _build_DelveCraftingModifierDescriptions(self, i, rng):
+        return {"Id": f"SyntheticFossilDescription{i}", "Description": f"Synthetic fossil description {i}"}
+
+    def _build_DelveCraftingModifiers(self, i, rng):
+        negative_tags = self._rows("Tags.dat64", rng, 3)
+        positive_tags = self._rows("Tags.dat64", rng, 3)
+        return {
+            "BaseItemTypesKey": self._row("BaseItemTypes.dat64", i),
+            "AddedModsKeys": self._rows("Mods.dat64", rng, 1),
+            "ForcedAddModsKeys": self._rows("Mods.dat64", rng, 1),
+            "NegativeWeight_TagsKeys": negative_tags,
+            "NegativeWeight_Values": [0 for _ in negative_tags],
+            "Weight_TagsKeys": positive_tags,
+            "Weight_Values": [rng.choice([1000, 500]) for _ in positive_tags],
+            "ForbiddenDelveCraftingTagsKeys": self._rows("DelveCraftingTags.dat64", rng, 1),
+            "AllowedDelveCraftingTagsKeys": self._rows("DelveCraftingTags.dat64", rng, 1),
+            "CorruptedEssenceChance": rng.choice([0, 30]),
+            "CanMirrorItem": False,
+            "CanImproveQuality": False,
+            "HasLuckyRolls": rng.random() < 0.1,
+            "CanRollWhiteSockets": False,
+            "SellPrice_ModsKeys": self._rows("Mods.dat64", rng, 1),
+            "DelveCraftingModifierDescriptionsKeys": self._rows("DelveCraftingModifierDescriptions.dat64", rng, 2),
+            "BlockedDelveCraftingModifierDescriptionsKeys": [],
+        }
+
+
+class _SyntheticRange:
+    def __init__(self, min, max, negated):
+        self.min = min
+        self.max = max
+        self.negated = negated
+
+
+class _SyntheticQuantifier:
+    def __init__(self, index_handlers):
+        self.index_handlers = index_handlers
+
+
+class _SyntheticString:
+    def __init__(self, as_format_string, tags, tags_types, range, index_handlers):
+        self.as_format_string = as_format_string
+        self.tags = tags
+        self.tags_types = tags_types
+        self.range = range
+        self.quantifier = _SyntheticQuantifier(index_handlers)
+
+
+class _SyntheticLanguage:
+    def __init__(self, strings):
+        self.strings = strings
+
+
+class SyntheticTranslation:
+    """the parts of PyPoE's Translation that the stat_translations module reads"""
+
+    def __init__(self, ids, strings):
+        self.ids = ids
+        self._english = _SyntheticLanguage(strings)
+
+    def get_language(self, language):
+        return self._english
+
+
+class _SyntheticTranslationFile:
+    def __init__(self, translations):
+        self.translations = translations
+
+
+def _create_translation(stat_ids, rng):
+    n_ids = len(stat_ids)
+    strings = []
+    for _ in range(rng.randint(1, 3)):
+        ranges = []
+        for _ in range(n_ids):
+            low = rng.choice([None, 1, -99])
+            ranges.append(_SyntheticRange(low, None if low is None else rng.choice([None, 99, -1]), rng.random() < 0.1))
+        tags = list(range(n_ids))
+        index_handlers = {}
+        if rng.random() < 0.3:
+            index_handlers[rng.choice(_INDEX_HANDLERS)] = [rng.randint(1, n_ids)]
+        format_string = " and ".join(f"{{{tag}}}% increased Synthetic Value {tag}" for tag in tags)
+        strings.append(
+            _SyntheticString(format_string, tags, [rng.choice(_TAG_TYPES) for _ in tags], ranges, index_handlers)
+        )
+    return SyntheticTranslation(stat_ids, strings)
+
+
+class SyntheticTranslationFileCache:
+    """serves translation files in the shape of the real description files: most of them include
+    stat_descriptions.txt, the skill files also include skill_stat_descriptions.txt"""
+
+    def __init__(self, relational_reader: SyntheticRelationalReader, file_names: List[str], seed: int = 0):
+        stats = [row["Id"] for row in relational_reader["Stats.dat64"]]
+        rng = random.Random(f"{seed}:translations")
+        counter = itertools.count()
+
+        def next_id():
+            # ids of a file have to be unique, so ids past the end of Stats.dat64 get a suffix
+            n, i = divmod(next(counter), len(stats))
+            return stats[i] if n == 0 else f"{stats[i]}_{n}"
+
+        def create_translations(count):
+            return [
+                _create_translation([next_id() for _ in range(rng.choice([1, 1, 1, 2, 3]))], rng) for _ in range(count)
+            ]
+
+        base = create_translations(len(stats))
+        skill = create_translations(len(stats) // 4)
+        self._files = {}
+        for file_name in file_names:
+            if file_name == "stat_descriptions.txt":
+                translations = base
+            elif file_name == "skill_stat_descriptions.txt":
+                translations = skill + base
+            elif file_name.endswith("_skill_stat_descriptions.txt"):
+                translations = create_translations(len(stats) // 50) + skill + base
+            else:
+                translations = create_translations(len(stats) // 20) + base
+            self._files[file_name] = _SyntheticTranslationFile(translations)
+
+    def __getitem__(self, file_name):
+        return self._files[file_name]
+
+
+class _SyntheticDirectory:
+    def __init__(self, children):
+        self.children = children
+
+
+class SyntheticFileSystem:
+    """file system with the description files and .dat64 tables of a synthetic game install. The content of a
+    table is made up of the settings it is generated from, so input hashes change whenever the generated rows do"""
+
+    def __init__(self, relational_reader: SyntheticRelationalReader, n_stat_description_files: int = 30):
+        self.relational_reader = relational_reader
+        self.stat_description_files = [
+            "stat_descriptions.txt",
+            "skill_stat_descriptions.txt",
+            "gem_stat_descriptions.txt",
+        ]
+        for i in range(n_stat_description_files - len(self.stat_description_files)):
+            suffix = "_skill_stat_descriptions.txt" if i % 2 else "_stat_descriptions.txt"
+            self.stat_description_files.append(f"synthetic{i}{suffix}")
+
+    def build_directory(self):
+        return {"Metadata": {"StatDescriptions": _SyntheticDirectory({f: None for f in self.stat_description_files})}}
+
+    def get_file(self, path):
+        if path == SKILL_POPUP_STAT_FILTERS:
+            # no skill has its own description file
+            return "".encode("utf-16")
+        if path.startswith(STAT_DESCRIPTION_PATH) and path[len(STAT_DESCRIPTION_PATH) :] in self.stat_description_files:
+            return path.encode("utf-16")
+        if path.startswith("Data/") and self.relational_reader.has_table(path[len("Data/") :]):
+            file_name = path[len("Data/") :]
+            reader = self.relational_reader
+            return f"{file_name}:{reader.seed}:{reader.gem_levels}:{reader.get_row_count(file_name)}".encode()
+        raise FileNotFoundError(path)
+
+
+def create_synthetic_game(rows: int = 1000, gem_levels: int = 20, seed: int = 0, n_stat_description_files: int = 30):
+    """returns the keyword arguments of Parser_Module.write (without data_path) for a synthetic game install"""
+    relational_reader = SyntheticRelationalReader(rows=rows, gem_levels=gem_levels, seed=seed)
+    file_system = SyntheticFileSystem(relational_reader, n_stat_description_files)
+    return {
+        "file_system": file_system,
+        "relational_reader": relational_reader,
+        "translation_file_cache": SyntheticTranslationFileCache(
+            relational_reader, file_system.stat_description_files, seed
+        ),
+        "ot_file_cache": {},
+    }
@@ -1,6 +1,10 @@
+import hashlib
+import inspect
 import json
-import io
+import os
+from contextlib import contextmanager
 
+import PyPoE
 from PyPoE.poe.file.dat import RelationalReader
 from PyPoE.poe.file.file_system import FileSystem
 from PyPoE.poe.file.ot import OTFileCache
@@ -22,13 +26,265 @@ def get_id_or_none(relational_file_cell):
     return None if relational_file_cell is None else relational_file_cell["Id"]
 
 
+def _get_value(row, key_path):
+    for key in key_path:
+        if row is None:
+            return None
+        row = row[key]
+    return row
+
+
+def _get_index_cache(relational_reader):
+    # stored on the reader, so all modules that are run with the same reader share the indices
+    cache = getattr(relational_reader, "repoe_index_cache", None)
+    if cache is None:
+        cache = relational_reader.repoe_index_cache = {}
+    return cache
+
+
+def _get_index(relational_reader, kind, file_name, key_path, build):
+    cache = _get_index_cache(relational_reader)
+    cache_key = (kind, file_name, tuple(key_path))
+    if cache_key not in cache:
+        cache[cache_key] = build(relational_reader[file_name], tuple(key_path))
+    return cache[cache_key]
+
+
+def _build_groups(rows, key_path):
+    groups = {}
+    for row in rows:
+        key = _get_value(row, key_path)
+        if key is not None:
+            if key not in groups:
+                groups[key] = []
+            groups[key].append(row)
+    return groups
+
+
+def _build_index(rows, key_path):
+    index = {}
+    for row in rows:
+        key = _get_value(row, key_path)
+        if key is not None:
+            index[key] = row
+    return index
+
+
+def _build_filter(rows, key_path):
+    return [row for row in rows if _get_value(row, key_path)]
+
+
+def group_by(relational_reader, file_name, key_path):
+    """rows of a table grouped by the value at key_path, e.g. ("GrantedEffect", "Id"), in table order.
+    Rows with None on the path are left out. Built once per reader, so the result must not be modified."""
+    return _get_index(relational_reader, "group_by", file_name, key_path, _build_groups)
+
+
+def index_by(relational_reader, file_name, key_path):
+    """like group_by, but maps each value to the last row with it"""
+    return _get_index(relational_reader, "index_by", file_name, key_path, _build_index)
+
+
+def where(relational_reader, file_name, key_path):
+    """rows of a table with a truthy value at key_path"""
+    return _get_index(relational_reader, "where", file_name, key_path, _build_filter)
+
+
+def _sort_keys(obj):
+    # json.dump with sort_keys would sort every dict again for each format, so a sorted copy is made once instead
+    if isinstance(obj, dict):
+        return {key: _sort_keys(obj[key]) for key in sorted(obj)}
+    if isinstance(obj, (list, tuple)):
+        return [_sort_keys(value) for value in obj]
+    return obj
+
+
+# paths of the files that write_text_file actually changed, see pop_changed_files
+_changed_files = []
+# paths of all files passed to write_text_file, changed or not, see pop_written_files
+_written_files = []
+
+
+def _is_unchanged(file_path, content):
+    try:
+        if os.path.getsize(file_path) != len(content):
+            return False
+        with open(file_path, "rb") as f:
+            return f.read() == content
+    except OSError:
+        return False
+
+
+def write_text_file(file_path, text):
+    """writes text to file_path, returns False and leaves the file (and its mtime) alone if its content is the same"""
+    content = text.encode("utf-8")
+    _written_files.append(file_path)
+    if _is_unchanged(file_path, content):
+        return False
+    # written to a temporary file first, so a crash never leaves a half written file behind
+    tmp_path = file_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _changed_files.append(file_path)
+    return True
+
+
+class _HashingWriter:
+    # encodes text written to it like write_text_file and hashes it on the way to the file
+
+    def __init__(self, file):
+        self._file = file
+        self.sha1 = hashlib.sha1()
+        self.size = 0
+        self.changed = None
+
+    def write(self, text):
+        content = text.encode("utf-8")
+        self.sha1.update(content)
+        self.size += len(content)
+        self._file.write(content)
+
+
+def _get_file_sha1(file_path, size):
+    # None if the file does not exist or has another size, the content can not be the same then
+    try:
+        if os.path.getsize(file_path) != size:
+            return None
+        sha1 = hashlib.sha1()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+    except OSError:
+        return None
+
+
+@contextmanager
+def open_atomic(file_path):
+    """streaming version of write_text_file: the yielded file is a temporary file, it only replaces file_path if its
+    content is different. writer.changed tells whether it did once the block is left"""
+    tmp_path = file_path + ".tmp"
+    _written_files.append(file_path)
+    try:
+        with open(tmp_path, "wb") as f:
+            writer = _HashingWriter(f)
+            yield writer
+        writer.changed = _get_file_sha1(file_path, writer.size) != writer.sha1.hexdigest()
+        if writer.changed:
+            os.replace(tmp_path, file_path)
+            _changed_files.append(file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def pop_changed_files():
+    """returns and forgets the paths of all files changed by write_text_file since the last call"""
+    changed_files = list(_changed_files)
+    _changed_files.clear()
+    return changed_files
+
+
+def pop_written_files():
+    """returns and forgets the paths of all files written by write_text_file since the last call, changed or not"""
+    written_files = list(_written_files)
+    _written_files.clear()
+    return written_files
+
+
 def write_json(root_obj, data_path, file_name):
+    root_obj = _sort_keys(root_obj)
     print("Writing '" + str(file_name) + ".json' ...", end="", flush=True)
-    json.dump(root_obj, io.open(data_path + file_name + ".json", mode="w"), indent=2, sort_keys=True)
-    print(" Done!")
+    changed = write_text_file(data_path + file_name + ".json", json.dumps(root_obj, indent=2))
+    print(" Done!" if changed else " Unchanged!")
     print("Writing '" + str(file_name) + ".min.json' ...", end="", flush=True)
-    json.dump(root_obj, io.open(data_path + file_name + ".min.json", mode="w"), separators=(",", ":"), sort_keys=True)
-    print(" Done!")
+    changed = write_text_file(data_path + file_name + ".min.json", json.dumps(root_obj, separators=(",", ":")))
+    print(" Done!" if changed else " Unchanged!")
+
+
+# input hashes and output files of every module of the last parser run, modules whose inputs did not change and
+# whose outputs still exist are skipped
+PARSER_MANIFEST_FILE_NAME = ".parser_manifest.json"
+
+# parser sources that every module uses, all modules run again if one of them changes
+SHARED_SOURCE_FILES = [
+    os.path.join(os.path.dirname(__file__), file_name) for file_name in ("__init__.py", "util.py", "constants.py")
+]
+
+
+def get_file_hash(file_system, path):
+    try:
+        data = file_system.get_file(path)
+    except (FileNotFoundError, KeyError):
+        # a missing file is hashed as None, the module runs again once it exists
+        return None
+    return hashlib.sha1(data).hexdigest()
+
+
+def get_local_files_hash(paths):
+    """hash of the paths and contents of files on disk, missing files are hashed by their path only"""
+    sha1 = hashlib.sha1()
+    for path in paths:
+        sha1.update(path.encode())
+        try:
+            with open(path, "rb") as f:
+                sha1.update(hashlib.sha1(f.read()).digest())
+        except OSError:
+            sha1.update(b"missing")
+    return sha1.hexdigest()
+
+
+def get_pypoe_hash():
+    """hash of the installed PyPoE version and the dat specifications it reads the tables with"""
+    spec_dir = os.path.dirname(inspect.getsourcefile(load))
+    spec_files = sorted(
+        os.path.join(root, file_name)
+        for root, _, file_names in os.walk(spec_dir)
+        for file_name in file_names
+        if file_name.endswith(".py")
+    )
+    sha1 = hashlib.sha1(str(getattr(PyPoE, "__version__", None)).encode())
+    sha1.update(get_local_files_hash(spec_files).encode())
+    return sha1.hexdigest()
+
+
+def get_module_input_hashes(parser_module, file_system, hash_cache):
+    """hashes of the sources and the input files of a Parser_Module, including the shared parser sources and PyPoE.
+    hash_cache is shared between modules, as most inputs are inputs of more than one module"""
+    with open(inspect.getsourcefile(parser_module), "rb") as f:
+        hashes = {"source": hashlib.sha1(f.read()).hexdigest()}
+    if "shared_sources" not in hash_cache:
+        hash_cache["shared_sources"] = get_local_files_hash(SHARED_SOURCE_FILES)
+        hash_cache["PyPoE"] = get_pypoe_hash()
+    hashes["shared_sources"] = hash_cache["shared_sources"]
+    hashes["PyPoE"] = hash_cache["PyPoE"]
+    local_files = parser_module.get_local_input_files()
+    if local_files:
+        hashes["local_files"] = get_local_files_hash(local_files)
+    for path in parser_module.get_input_files(file_system):
+        if path not in hash_cache:
+            hash_cache[path] = get_file_hash(file_system, path)
+        hashes[path] = hash_cache[path]
+    return hashes
+
+
+def load_parser_manifest(data_path):
+    try:
+        with open(data_path + PARSER_MANIFEST_FILE_NAME) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_parser_manifest(manifest, data_path):
+    with open(data_path + PARSER_MANIFEST_FILE_NAME, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
 
 
 def load_file_system(ggpk_path):
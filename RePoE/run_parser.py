@@ -1,13 +1,18 @@
 import argparse
+import contextlib
+import hashlib
+import io
 import json
+import tempfile
 
+from concurrent.futures import ProcessPoolExecutor
 from importlib import reload
-from typing import List
 import requests
 import os
 
 from RePoE import __DATA_PATH__
 import RePoE
+from RePoE.parser.instrumentation import measure, print_summary, write_report
 from RePoE.parser.modules import get_parser_modules
 
 from RePoE.parser.util import (
@@ -16,8 +21,14 @@ from RePoE.parser.util import (
     DEFAULT_GGPK_PATH,
     create_ot_file_cache,
     load_file_system,
+    get_module_input_hashes,
+    load_parser_manifest,
+    open_atomic,
+    write_parser_manifest,
+    pop_changed_files,
+    pop_written_files,
 )
-from RePoE.poe_types import StatTranslation
+from RePoE.stat_translation_files import __STAT_TRANSLATION_PATH__, iter_stat_translation_files
 from RePoE.wiki import fetch_wiki_data
 
 
@@ -39,69 +50,241 @@ def main():
     )
     parser.add_argument("-f", "--file", default=DEFAULT_GGPK_PATH,
                         help="path to your Content.ggpk file")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of modules to run in parallel, each in its own process")
+    parser.add_argument("--force", action="store_true",
+                        help="run the selected modules even if their input files did not change since the last run")
+    parser.add_argument("--report", action="store_true",
+                        help="write the timings, memory usage and rows read of every module to parser_report.json")
     args = parser.parse_args()
 
-    print("Loading GGPK ...", end="", flush=True)
-    file_system = load_file_system(args.file)
-    print(" Done!")
-
     selected_module_names = args.module_names
     if "all" in selected_module_names:
         selected_module_names = [m for m in module_names if m != "all"]
 
-    rr = create_relational_reader(file_system)
-    tfc = create_translation_file_cache(file_system)
-    otfc = create_ot_file_cache(file_system)
-
     selected_modules = [
         m for m in modules if m.__name__ in selected_module_names]
+
+    measurements = []
+    print("Loading GGPK ...", end="", flush=True)
+    with measure("load_ggpk", measurements):
+        file_system = load_file_system(args.file)
+    print(" Done!")
+
+    # modules are skipped if their sources and input files are the same as in the last run and their output files
+    # still exist
+    manifest = load_parser_manifest(__DATA_PATH__)
+    hash_cache = {}
+    input_hashes = {m.__name__: get_module_input_hashes(m, file_system, hash_cache) for m in selected_modules}
+    if not args.force:
+        unchanged_modules = [
+            m for m in selected_modules if _is_up_to_date(manifest.get(m.__name__), input_hashes[m.__name__])
+        ]
+        for parser_module in unchanged_modules:
+            print("Skipping module '%s', its inputs did not change" % parser_module.__name__)
+        selected_modules = [m for m in selected_modules if m not in unchanged_modules]
+
+    changed_files = []
+    # output files of every module that runs, relative to the data folder
+    output_files = {}
+    if args.jobs > 1:
+        changed_files = _run_modules_in_parallel(selected_modules, args.file, args.jobs, measurements, output_files)
+    else:
+        with measure("create_readers", measurements):
+            rr = create_relational_reader(file_system)
+            tfc = create_translation_file_cache(file_system)
+            otfc = create_ot_file_cache(file_system)
+
+        for parser_module in selected_modules:
+            print("Running module '%s'" % parser_module.__name__)
+            parser_module.run(
+                measurements,
+                file_system=file_system,
+                data_path=__DATA_PATH__,
+                relational_reader=rr,
+                translation_file_cache=tfc,
+                ot_file_cache=otfc,
+            )
+            output_files[parser_module.__name__] = _get_relative_paths(pop_written_files())
+
     for parser_module in selected_modules:
-        print("Running module '%s'" % parser_module.__name__)
-        parser_module.write(
-            file_system=file_system,
-            data_path=__DATA_PATH__,
-            relational_reader=rr,
-            translation_file_cache=tfc,
-            ot_file_cache=otfc,
-        )
+        manifest[parser_module.__name__] = {
+            "inputs": input_hashes[parser_module.__name__],
+            "outputs": output_files[parser_module.__name__],
+        }
+    write_parser_manifest(manifest, __DATA_PATH__)
+
+    # files with the same content as before are not rewritten, so only these have a new mtime
+    changed_files.extend(pop_changed_files())
+    _print_changed_files(changed_files)
+
+    print_summary(measurements)
+    if args.report:
+        write_report(measurements, __DATA_PATH__)
 
     # This forces the globals to be up to date with what we just parsed, in case someone uses `run_parser` within a script
     reload(RePoE)
 
 
-def fetch_trees():
-    skill_tree_url = "https://raw.githubusercontent.com/grindinggear/skilltree-export/fea1986f746d6c8ba9dfc391c755a91c2ef0baed/data.json"
-    with open(os.path.join(__DATA_PATH__, "skill_tree.min.json"), "w") as f:
-        json_string = requests.get(skill_tree_url).json()
-        f.write(json.dumps(json_string, separators=(",", ":"), sort_keys=True))
+def _get_relative_paths(file_paths):
+    return sorted(os.path.relpath(file_path, __DATA_PATH__) for file_path in file_paths)
+
+
+def _is_up_to_date(manifest_entry, input_hashes):
+    # entries of manifests written before output files were recorded only contain the input hashes
+    if not manifest_entry or "inputs" not in manifest_entry or manifest_entry["inputs"] != input_hashes:
+        return False
+    return all(os.path.exists(os.path.join(__DATA_PATH__, file_path)) for file_path in manifest_entry["outputs"])
+
+
+# file system and readers of a worker process, every worker loads its own
+_worker_state = {}
+# measurements of the worker's setup, handed to the main process with the first module's results
+_worker_measurements = []
 
-    atlas_tree_url = "https://raw.githubusercontent.com/grindinggear/atlastree-export/master/data.json"
-    with open(os.path.join(__DATA_PATH__, "atlas_tree.min.json"), "w") as f:
-        json_string = requests.get(atlas_tree_url).json()
-        f.write(json.dumps(json_string, separators=(",", ":"), sort_keys=True))
 
+def _init_worker(ggpk_path):
+    with measure("load_ggpk (worker)", _worker_measurements):
+        file_system = load_file_system(ggpk_path)
+    with measure("create_readers (worker)", _worker_measurements):
+        _worker_state["file_system"] = file_system
+        _worker_state["relational_reader"] = create_relational_reader(file_system)
+        _worker_state["translation_file_cache"] = create_translation_file_cache(file_system)
+        _worker_state["ot_file_cache"] = create_ot_file_cache(file_system)
 
 
+def _run_module_in_worker(module_name):
+    # output is collected and returned, so the main process can print it in a deterministic order
+    parser_module = next(m for m in get_parser_modules() if m.__name__ == module_name)
+    output = io.StringIO()
+    measurements = list(_worker_measurements)
+    _worker_measurements.clear()
+    with contextlib.redirect_stdout(output):
+        parser_module.run(measurements, data_path=__DATA_PATH__, **_worker_state)
+    return output.getvalue(), pop_changed_files(), pop_written_files(), measurements
 
-def combine_translations():
-    all_translations = []
+
+def _run_modules_in_parallel(selected_modules, ggpk_path, jobs, measurements, output_files):
+    print(f"Running {len(selected_modules)} modules in {jobs} processes ...", flush=True)
+    changed_files = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(ggpk_path,)) as executor:
+        futures = [executor.submit(_run_module_in_worker, m.__name__) for m in selected_modules]
+        for parser_module, future in zip(selected_modules, futures):
+            output, module_changed_files, module_written_files, module_measurements = future.result()
+            print("Running module '%s'" % parser_module.__name__)
+            print(output, end="", flush=True)
+            changed_files.extend(module_changed_files)
+            output_files[parser_module.__name__] = _get_relative_paths(module_written_files)
+            measurements.extend(module_measurements)
+    return changed_files
+
+
+# the skill tree is pinned to a commit of the export, so it is only downloaded again once the commit changes. The
+# sources can be overridden with a url or a local file, e.g. to run offline against a fixture
+SKILL_TREE_URL = (
+    "https://raw.githubusercontent.com/grindinggear/skilltree-export/fea1986f746d6c8ba9dfc391c755a91c2ef0baed/data.json"
+)
+ATLAS_TREE_URL = "https://raw.githubusercontent.com/grindinggear/atlastree-export/master/data.json"
+SKILL_TREE_SOURCE_ENV = "REPOE_SKILL_TREE_SOURCE"
+ATLAS_TREE_SOURCE_ENV = "REPOE_ATLAS_TREE_SOURCE"
+# source and sha256 of the last tree that was written to each file
+TREES_MANIFEST_FILE_NAME = ".trees_manifest.json"
+
+
+def _is_pinned(source):
+    # raw.githubusercontent.com urls that contain a full commit hash instead of a branch name never change
+    return source.startswith("http") and any(
+        len(part) == 40 and all(c in "0123456789abcdef" for c in part) for part in source.split("/")
+    )
+
+
+def _download_tree(source, file):
+    """copies source (a url or a local file) to file in chunks, returns its sha256"""
+    sha256 = hashlib.sha256()
+    if source.startswith(("http://", "https://")):
+        with requests.get(source, stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                sha256.update(chunk)
+                file.write(chunk)
+    else:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                sha256.update(chunk)
+                file.write(chunk)
+    return sha256.hexdigest()
+
+
+def _fetch_tree(source, file_name, data_path, manifest):
+    file_path = os.path.join(data_path, file_name)
+    previous = manifest.get(file_name, {})
+    if os.path.exists(file_path) and previous.get("source") == source and _is_pinned(source):
+        print(f"Skipping '{file_name}', the pinned commit did not change")
+        return
+    print(f"Fetching '{file_name}' from {source} ...", end="", flush=True)
+    with tempfile.TemporaryFile() as f:
+        sha256 = _download_tree(source, f)
+        if os.path.exists(file_path) and previous.get("sha256") == sha256:
+            manifest[file_name] = {"source": source, "sha256": sha256}
+            print(" Unchanged!")
+            return
+        f.seek(0)
+        tree = json.load(f)
+    with open_atomic(file_path) as f:
+        json.dump(tree, f, separators=(",", ":"), sort_keys=True)
+    manifest[file_name] = {"source": source, "sha256": sha256}
+    print(" Done!" if f.changed else " Unchanged!")
+
+
+def fetch_trees(skill_tree_source=None, atlas_tree_source=None, data_path=__DATA_PATH__):
+    manifest_path = os.path.join(data_path, TREES_MANIFEST_FILE_NAME)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    skill_tree_source = skill_tree_source or os.environ.get(SKILL_TREE_SOURCE_ENV) or SKILL_TREE_URL
+    atlas_tree_source = atlas_tree_source or os.environ.get(ATLAS_TREE_SOURCE_ENV) or ATLAS_TREE_URL
+    _fetch_tree(skill_tree_source, "skill_tree.min.json", data_path, manifest)
+    _fetch_tree(atlas_tree_source, "atlas_tree.min.json", data_path, manifest)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def combine_translations(stat_translation_path=__STAT_TRANSLATION_PATH__, data_path=__DATA_PATH__):
+    # translations are written as soon as they are read, one file is decoded at a time. The output is the same as
+    # json.dump of the whole list with separators=(",", ":") and with indent=4 respectively
+    # files with the same content as before are left alone, like the ones of the parser modules
     handled_id_tuples = set()
-    # iterate over RePoE/data/stat_translations/*.min.json
-    for filename in os.listdir("RePoE/data/stat_translations"):
-        with open(os.path.join("RePoE/data/stat_translations", filename), "r") as f:
-            translation_table: List[StatTranslation] = json.load(f)
-        for translation in translation_table:
-            ids = tuple(translation["ids"])
-            if ids in handled_id_tuples:
-                continue
-            handled_id_tuples.add(ids)
-            all_translations.append(translation)
-    
-    with open("RePoE/data/stat_translations.min.json", "w") as f:
-        json.dump(all_translations, f, separators=(",", ":"))
-    with open("RePoE/data/stat_translations.json", "w") as f:
-        json.dump(all_translations, f, indent=4)
+    print("Writing 'stat_translations.json' and 'stat_translations.min.json' ...", end="", flush=True)
+    with open_atomic(os.path.join(data_path, "stat_translations.min.json")) as min_file, open_atomic(
+        os.path.join(data_path, "stat_translations.json")
+    ) as indented_file:
+        min_file.write("[")
+        indented_file.write("[")
+        for _, translation_table in iter_stat_translation_files(stat_translation_path):
+            for translation in translation_table:
+                ids = tuple(translation["ids"])
+                if ids in handled_id_tuples:
+                    continue
+                if handled_id_tuples:
+                    min_file.write(",")
+                    indented_file.write(",")
+                handled_id_tuples.add(ids)
+                min_file.write(json.dumps(translation, separators=(",", ":")))
+                indented_file.write("\n    " + json.dumps(translation, indent=4).replace("\n", "\n    "))
+        min_file.write("]")
+        indented_file.write("\n]" if handled_id_tuples else "]")
+    print(" Done!" if min_file.changed or indented_file.changed else " Unchanged!")
+
 
+def _print_changed_files(changed_files):
+    if changed_files:
+        print("Changed files:")
+        for file_path in sorted(changed_files):
+            print("  " + os.path.relpath(file_path, __DATA_PATH__))
+    else:
+        print("No files changed")
 
 
 if __name__ == "__main__":
@@ -109,3 +292,5 @@ if __name__ == "__main__":
     fetch_trees()
     fetch_wiki_data()
     combine_translations()
+    # files written after main printed its report, the trees and the combined translations
+    _print_changed_files(pop_changed_files())
@@ -0,0 +1,131 @@
+"""Binary snapshots of the json datasets, so processes that start often don't have to decode json every time.
+
+Snapshots are disabled by default. They are enabled by setting the REPOE_SNAPSHOT_DIR environment variable or by
+calling enable_snapshot_cache() before a dataset is accessed. A snapshot is keyed on the size, mtime and content hash
+of its json file and is rebuilt automatically once the json file changes.
+"""
+import gc
+import hashlib
+import json
+import marshal
+import os
+import struct
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Optional
+
+SNAPSHOT_DIR_ENV = "REPOE_SNAPSHOT_DIR"
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "RePoE")
+
+# marshal data is only valid for the python version that wrote it
+_FORMAT = (marshal.version, sys.version_info[:2])
+# a snapshot starts with the length of its key, followed by the key and the data
+_KEY_LENGTH = struct.Struct("<Q")
+
+_snapshot_dir: Optional[str] = os.environ.get(SNAPSHOT_DIR_ENV) or None
+
+
+def enable_snapshot_cache(snapshot_dir: Optional[str] = None):
+    global _snapshot_dir
+    _snapshot_dir = snapshot_dir or DEFAULT_SNAPSHOT_DIR
+
+
+def disable_snapshot_cache():
+    global _snapshot_dir
+    _snapshot_dir = None
+
+
+@contextmanager
+def _gc_paused():
+    # decoding creates lots of containers that the garbage collector would otherwise scan over and over
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _get_snapshot_path(file_path: str) -> str:
+    # wikidata and data both contain a base_items.min.json, so the snapshot name is based on the full path
+    absolute_path = os.path.abspath(file_path)
+    name = os.path.basename(absolute_path).replace(".min.json", "")
+    path_hash = hashlib.sha1(absolute_path.encode()).hexdigest()[:16]
+    return os.path.join(_snapshot_dir, f"{name}.{path_hash}.marshal")
+
+
+def _read_snapshot(snapshot_path: str, stat: os.stat_result, get_digest):
+    # returns the snapshot data and whether its key has to be rewritten, or None if it is missing or outdated
+    try:
+        # marshal.load reads file objects in many small chunks, so whole blocks are read and passed to loads instead
+        with open(snapshot_path, "rb") as f:
+            (key_length,) = _KEY_LENGTH.unpack(f.read(_KEY_LENGTH.size))
+            if key_length > os.fstat(f.fileno()).st_size:
+                return None
+            key = marshal.loads(f.read(key_length))
+            if key["format"] != _FORMAT:
+                return None
+            if key["size"] == stat.st_size and key["mtime_ns"] == stat.st_mtime_ns:
+                return marshal.loads(f.read()), False
+            if key["size"] == stat.st_size and key["sha256"] == get_digest():
+                # the file was touched, but its content is the same
+                return marshal.loads(f.read()), True
+    except (OSError, EOFError, ValueError, TypeError, KeyError, struct.error):
+        pass
+    return None
+
+
+def _write_snapshot(snapshot_path: str, stat: os.stat_result, digest: str, data):
+    key = {"format": _FORMAT, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    # written to a temporary file first, so other processes never see a half written snapshot
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(snapshot_path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            key_bytes = marshal.dumps(key)
+            f.write(_KEY_LENGTH.pack(len(key_bytes)))
+            f.write(key_bytes)
+            f.write(marshal.dumps(data))
+        os.replace(tmp_path, snapshot_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_json_file(file_path: str):
+    """loads a json file, going through its snapshot if snapshots are enabled"""
+    if _snapshot_dir is None:
+        with open(file_path, "rb") as f, _gc_paused():
+            return json.load(f)
+
+    stat = os.stat(file_path)
+    content = None
+    digest = None
+
+    def get_digest():
+        # the file is only read and hashed if size and mtime don't match the snapshot
+        nonlocal content, digest
+        if digest is None:
+            with open(file_path, "rb") as f:
+                content = f.read()
+            digest = hashlib.sha256(content).hexdigest()
+        return digest
+
+    snapshot_path = _get_snapshot_path(file_path)
+    with _gc_paused():
+        snapshot = _read_snapshot(snapshot_path, stat, get_digest)
+        if snapshot is not None:
+            data, outdated_key = snapshot
+        else:
+            get_digest()
+            data = json.loads(content)
+            outdated_key = True
+    if outdated_key:
+        try:
+            _write_snapshot(snapshot_path, stat, get_digest(), data)
+        except OSError:
+            # a read-only cache directory only costs speed
+            pass
+    return data
@@ -0,0 +1,81 @@
+"""A module to load the per-file stat translations in RePoE/data/stat_translations
+
+Most of these files are written as an overlay on top of another table (see parser/modules/stat_translations.py):
+{"base": <name of the base table>, "entries": [...]}, where each entry is either a translation or a [start, stop]
+slice of the base table. The functions here resolve overlays, so each file is returned as its full list of
+translations. Translations taken over from a base table are shared between all files that include them.
+"""
+import os
+from typing import Dict, Iterator, List, Tuple
+
+from RePoE import __DATA_PATH__
+from RePoE.poe_types import StatTranslation
+from RePoE.snapshot import load_json_file
+
+__STAT_TRANSLATION_PATH__ = os.path.join(__DATA_PATH__, "stat_translations", "")
+
+# table that the other files are based on, it is not a stat description file itself
+SHARED_BASE_NAME = "_base"
+
+_loaded: Dict[str, List[StatTranslation]] = {}
+
+
+def resolve_overlay(overlay: dict, base: List[StatTranslation]) -> List[StatTranslation]:
+    translations = []
+    for entry in overlay["entries"]:
+        if isinstance(entry, list):
+            translations.extend(base[entry[0] : entry[1]])
+        else:
+            translations.append(entry)
+    return translations
+
+
+def load_stat_translation_file(
+    name: str, stat_translation_path: str = __STAT_TRANSLATION_PATH__
+) -> List[StatTranslation]:
+    """returns the translations of a file in the stat_translations folder, e.g. "skill" or "support_gem" """
+    file_path = os.path.join(stat_translation_path, name + ".min.json")
+    if file_path not in _loaded:
+        data = load_json_file(file_path)
+        # files written before overlays were introduced are plain lists
+        if isinstance(data, dict):
+            data = resolve_overlay(data, load_stat_translation_file(data["base"], stat_translation_path))
+        _loaded[file_path] = data
+    return _loaded[file_path]
+
+
+def get_stat_translation_file_names(stat_translation_path: str = __STAT_TRANSLATION_PATH__) -> List[str]:
+    return sorted(
+        file_name[: -len(".min.json")]
+        for file_name in os.listdir(stat_translation_path)
+        if file_name.endswith(".min.json") and file_name != SHARED_BASE_NAME + ".min.json"
+    )
+
+
+def iter_stat_translation_files(
+    stat_translation_path: str = __STAT_TRANSLATION_PATH__,
+) -> Iterator[Tuple[str, List[StatTranslation]]]:
+    """yields the name and translations of every file in the stat_translations folder, sorted by name
+
+    Unlike load_stat_translation_file, nothing is cached, only the tables that overlays are based on are kept while
+    iterating. Use this to go through all files once without holding all of them in memory.
+    """
+    bases: Dict[str, List[StatTranslation]] = {}
+
+    def load(name: str) -> List[StatTranslation]:
+        data = load_json_file(os.path.join(stat_translation_path, name + ".min.json"))
+        if isinstance(data, dict):
+            if data["base"] not in bases:
+                bases[data["base"]] = load(data["base"])
+            data = resolve_overlay(data, bases[data["base"]])
+        return data
+
+    for name in get_stat_translation_file_names(stat_translation_path):
+        yield name, bases[name] if name in bases else load(name)
+
+
+def __getattr__(name: str):
+    # every file is available as an attribute, e.g. RePoE.stat_translation_files.skill
+    if not name.startswith("_") and name in get_stat_translation_file_names():
+        return load_stat_translation_file(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
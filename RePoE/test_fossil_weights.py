@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from RePoE.fossil_weights import FossilWeights
+from RePoE.mod_pool import ModPool
+
+
+def make_mod(domain, generation_type, spawn_weights, implicit_tags=(), required_level=1, is_essence_only=False):
+    return {
+        "domain": domain,
+        "generation_type": generation_type,
+        "groups": [],
+        "spawn_weights": [{"tag": tag, "weight": weight} for tag, weight in spawn_weights],
+        "generation_weights": [],
+        "implicit_tags": list(implicit_tags),
+        "required_level": required_level,
+        "is_essence_only": is_essence_only,
+    }
+
+
+def make_fossil(added_mods=(), positive_mod_weights=()):
+    return {
+        "allowed_tags": [],
+        "forbidden_tags": [],
+        "added_mods": list(added_mods),
+        "forced_mods": [],
+        "positive_mod_weights": [{"tag": tag, "weight": weight} for tag, weight in positive_mod_weights],
+        "negative_mod_weights": [],
+    }
+
+
+MODS = {
+    "IncreasedLife1": make_mod("item", "prefix", [("ring", 1000)], ["life"]),
+    "IncreasedLife2": make_mod("item", "prefix", [("ring", 1000)], ["life"], required_level=80),
+    "EssenceLife": make_mod("item", "prefix", [("ring", 1000)], ["life"], is_essence_only=True),
+    # fossil only mods are in the delve domain
+    "DelveStrengthGemLevel1": make_mod("delve", "prefix", [("ring", 500), ("default", 0)], ["gem"]),
+    "DelveAmuletOnly": make_mod("delve", "suffix", [("amulet", 500), ("default", 0)]),
+    "DelveHighLevel": make_mod("delve", "suffix", [("ring", 500)], required_level=80),
+}
+BASE_ITEMS = {"Ring": {"tags": ["ring", "default"]}}
+FOSSILS = {
+    "Faceted": make_fossil(added_mods=["DelveStrengthGemLevel1", "DelveAmuletOnly", "DelveHighLevel"]),
+    "Pristine": make_fossil(positive_mod_weights=[("life", 1000)]),
+}
+
+
+def get_fossil_weights():
+    return FossilWeights("Ring", item_level=50, mod_pool=ModPool(MODS, BASE_ITEMS), fossils=FOSSILS)
+
+
+def test_added_mods_of_other_domains():
+    fossil_weights = get_fossil_weights()
+    assert fossil_weights.mod_ids == ["IncreasedLife1", "DelveStrengthGemLevel1"]
+    assert fossil_weights.get_weight_dict(["Faceted"]) == {"IncreasedLife1": 1000, "DelveStrengthGemLevel1": 500}
+
+
+def test_added_mods_need_the_fossil():
+    fossil_weights = get_fossil_weights()
+    assert fossil_weights.get_weight_dict(["Pristine"]) == {"IncreasedLife1": 10000}
+    assert fossil_weights.get_weight_dict(["Faceted", "Pristine"]) == {
+        "IncreasedLife1": 10000,
+        "DelveStrengthGemLevel1": 500,
+    }
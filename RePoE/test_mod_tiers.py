@@ -0,0 +1,58 @@
+from RePoE.mod_pool import ModPool
+from RePoE.mod_tiers import ModTiers, can_roll
+
+
+def make_mod(required_level, maximum, spawn_weights=(("ring", 1000), ("amulet", 1000)), is_essence_only=False):
+    return {
+        "type": "IncreasedLife",
+        "groups": ["IncreasedLife"],
+        "domain": "item",
+        "generation_type": "prefix",
+        "spawn_weights": [{"tag": tag, "weight": weight} for tag, weight in spawn_weights],
+        "generation_weights": [],
+        "required_level": required_level,
+        "stats": [{"id": "base_maximum_life", "min": maximum - 9, "max": maximum}],
+        "is_essence_only": is_essence_only,
+    }
+
+
+MODS = {
+    "IncreasedLife1": make_mod(1, 19),
+    "IncreasedLife2": make_mod(30, 39),
+    "IncreasedLife3": make_mod(60, 59, spawn_weights=(("amulet", 1000),)),
+    # better than every tier, but never rolls
+    "EssenceLife": make_mod(82, 99, is_essence_only=True),
+    "IncreasedLifeNoWeight": make_mod(86, 119, spawn_weights=(("ring", 0), ("default", 0))),
+}
+BASE_ITEMS = {"Ring": {"tags": ["ring", "default"]}, "Amulet": {"tags": ["amulet", "default"]}}
+
+
+def get_mod_tiers():
+    return ModTiers(ModPool(MODS, BASE_ITEMS))
+
+
+def test_tier_1_can_roll():
+    mod_tiers = get_mod_tiers()
+    for ladder in mod_tiers.ladders.values():
+        assert can_roll(MODS[ladder.mod_ids[0]])
+    for base_item_id in BASE_ITEMS:
+        ladder = mod_tiers.get_ladder("IncreasedLife1", base_item_id)
+        assert can_roll(MODS[ladder.mod_ids[0]])
+
+
+def test_tiers_leave_out_mods_that_can_not_roll():
+    mod_tiers = get_mod_tiers()
+    assert mod_tiers.get_tier("IncreasedLife3") == 1
+    assert mod_tiers.get_tier("IncreasedLife1") == 3
+    assert mod_tiers.get_tier("EssenceLife") is None
+    assert mod_tiers.get_tier("IncreasedLifeNoWeight") is None
+    assert mod_tiers.get_best_tier("EssenceLife", 100) == (1, "IncreasedLife3")
+
+
+def test_tiers_of_a_base():
+    mod_tiers = get_mod_tiers()
+    assert mod_tiers.get_tier("IncreasedLife2", "Ring") == 1
+    assert mod_tiers.get_tier("IncreasedLife3", "Ring") is None
+    assert mod_tiers.get_best_tier("IncreasedLife1", 100, "Ring") == (1, "IncreasedLife2")
+    assert mod_tiers.get_best_tier("IncreasedLife1", 20, "Ring") == (2, "IncreasedLife1")
+    assert mod_tiers.get_best_tier("IncreasedLife1", 0, "Ring") == (None, None)
@@ -1,21 +1,276 @@
-
 import math
-from typing import Callable, Dict, List, Literal, Optional, Tuple, Union
+import re
+import string
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Literal, NamedTuple, Optional, Sequence, Tuple, Union
 from venv import logger
 
-from RePoE.poe_types import StatTranslation, TranslationCondition
-from RePoE import mods, stat_translations, cluster_jewels
+from RePoE.poe_types import ModStat, StatTranslation, TranslationCondition, TranslationInstance
+import RePoE
+
+INDEX_HANDLERS: Dict[str, Callable[[float], float]] = {
+    "divide_by_twenty": lambda value: value / 20,
+    "divide_by_fifteen_0dp": lambda value: value // 15,
+    "times_one_point_five": lambda value: value * 1.5,
+    "mod_value_to_item_class": lambda value: value,
+    # Reward from selling a crucible weapon with a weapon tree reward node
+    "weapon_tree_unique_base_type_name": lambda value: value,
+    # Replica Dragonfang. No idea how to map values to skills
+    "display_indexable_skill": lambda value: value,
+    "locations_to_metres": lambda value: round(value / 10, 1),
+    "divide_by_one_thousand": lambda value: value / 1000,
+    # not sure how to handle this
+    "tree_expansion_jewel_passive": lambda value: value,
+    "divide_by_twenty_then_double_0dp": lambda value: value // 10,
+    "milliseconds_to_seconds_0dp": lambda value: value // 1000,
+    # only one weird case so ignoring
+    "multiplicative_damage_modifier": lambda value: value,
+    "divide_by_ten_0dp": lambda value: value // 10,
+    "divide_by_two_0dp": lambda value: value // 2,
+    "divide_by_ten_1dp": lambda value: round(value / 10, 1),
+    "divide_by_ten_1dp_if_required": lambda value: round(value / 10, 1),
+    "divide_by_one_hundred_2dp": lambda value: round(value / 100, 2),
+    "per_minute_to_per_second_2dp_if_required": lambda value: round(value / 60, 2),
+    "30%_of_value": lambda value: value * 0.3,
+    "deciseconds_to_seconds": lambda value: value / 10,
+    "old_leech_permyriad": lambda value: value / 10000,
+    "divide_by_four": lambda value: value / 4,
+    "60%_of_value": lambda value: value * 0.6,
+    "divide_by_one_hundred_2dp_if_required": lambda value: round(value / 100, 2),
+    "milliseconds_to_seconds": lambda value: value / 1000,
+    "negate": lambda value: -value,
+    "canonical_stat": lambda value: value,
+    "divide_by_twelve": lambda value: value / 12,
+    "times_twenty": lambda value: value * 20,
+    "divide_by_six": lambda value: value / 6,
+    "divide_by_fifty": lambda value: value / 50,
+    # Forbidden Shako. No idea how to map values to supports
+    "display_indexable_support": lambda value: value,
+    "per_minute_to_per_second_0dp": lambda value: math.floor(value / 60),
+    "divide_by_one_hundred_and_negate": lambda value: -value / 100,
+    "per_minute_to_per_second_1dp": lambda value: round(value / 60, 1),
+    "milliseconds_to_seconds_1dp": lambda value: round(value / 1000, 1),
+    "per_minute_to_per_second_2dp": lambda value: round(value / 60, 2),
+    "plus_two_hundred": lambda value: value + 200,
+    "divide_by_three": lambda value: value / 3,
+    "per_minute_to_per_second": lambda value: value / 60,
+    "old_leech_percent": lambda value: value / 100,
+    "divide_by_five": lambda value: value / 5,
+    "milliseconds_to_seconds_2dp_if_required": lambda value: round(value / 1000, 2),
+    "divide_by_one_hundred": lambda value: value / 100,
+    # delirium rewards. No idea how to map values to rewards
+    "affliction_reward_type": lambda value: value,
+    # not sure how to handle this
+    "passive_hash": lambda value: value,
+    "negate_and_double": lambda value: -value * 2,
+    "double": lambda value: value * 2,
+}
+
+# inverse of INDEX_HANDLERS, used to turn displayed values back into stat values.
+# handlers that round or only change how a value is displayed are inverted approximately
+INVERSE_INDEX_HANDLERS: Dict[str, Callable[[float], float]] = {
+    "divide_by_twenty": lambda value: value * 20,
+    "divide_by_fifteen_0dp": lambda value: value * 15,
+    "times_one_point_five": lambda value: value / 1.5,
+    "mod_value_to_item_class": lambda value: value,
+    "weapon_tree_unique_base_type_name": lambda value: value,
+    "display_indexable_skill": lambda value: value,
+    "locations_to_metres": lambda value: value * 10,
+    "divide_by_one_thousand": lambda value: value * 1000,
+    "tree_expansion_jewel_passive": lambda value: value,
+    "divide_by_twenty_then_double_0dp": lambda value: value * 10,
+    "milliseconds_to_seconds_0dp": lambda value: value * 1000,
+    "multiplicative_damage_modifier": lambda value: value,
+    "divide_by_ten_0dp": lambda value: value * 10,
+    "divide_by_two_0dp": lambda value: value * 2,
+    "divide_by_ten_1dp": lambda value: value * 10,
+    "divide_by_ten_1dp_if_required": lambda value: value * 10,
+    "divide_by_one_hundred_2dp": lambda value: value * 100,
+    "per_minute_to_per_second_2dp_if_required": lambda value: value * 60,
+    "30%_of_value": lambda value: value / 0.3,
+    "deciseconds_to_seconds": lambda value: value * 10,
+    "old_leech_permyriad": lambda value: value * 10000,
+    "divide_by_four": lambda value: value * 4,
+    "60%_of_value": lambda value: value / 0.6,
+    "divide_by_one_hundred_2dp_if_required": lambda value: value * 100,
+    "milliseconds_to_seconds": lambda value: value * 1000,
+    "negate": lambda value: -value,
+    "canonical_stat": lambda value: value,
+    "divide_by_twelve": lambda value: value * 12,
+    "times_twenty": lambda value: value / 20,
+    "divide_by_six": lambda value: value * 6,
+    "divide_by_fifty": lambda value: value * 50,
+    "display_indexable_support": lambda value: value,
+    "per_minute_to_per_second_0dp": lambda value: value * 60,
+    "divide_by_one_hundred_and_negate": lambda value: -value * 100,
+    "per_minute_to_per_second_1dp": lambda value: value * 60,
+    "milliseconds_to_seconds_1dp": lambda value: value * 1000,
+    "per_minute_to_per_second_2dp": lambda value: value * 60,
+    "plus_two_hundred": lambda value: value - 200,
+    "divide_by_three": lambda value: value * 3,
+    "per_minute_to_per_second": lambda value: value * 60,
+    "old_leech_percent": lambda value: value * 100,
+    "divide_by_five": lambda value: value * 5,
+    "milliseconds_to_seconds_2dp_if_required": lambda value: value * 1000,
+    "divide_by_one_hundred": lambda value: value * 100,
+    "affliction_reward_type": lambda value: value,
+    "passive_hash": lambda value: value,
+    "negate_and_double": lambda value: -value / 2,
+    "double": lambda value: value / 2,
+}
+
+# prefixes that are put in front of a translated value, values with the "ignore" format are not displayed
+FORMAT_PREFIXES: Dict[str, str] = {"#": "", "+#": "+"}
+
+
+def _compose_index_handlers(handlers: List[str]) -> Optional[Callable[[float], float]]:
+    # chains the index handlers of a single value into one function, None means the value is left untouched
+    functions = [INDEX_HANDLERS[handler] for handler in handlers]
+    if not functions:
+        return None
+    if len(functions) == 1:
+        return functions[0]
+
+    def pipeline(value: float) -> float:
+        for function in functions:
+            value = function(value)
+        return value
+
+    return pipeline
+
+
+class CompiledTranslation:
+    # a translation candidate with everything that does not depend on the stat values resolved ahead of time
+
+    __slots__ = ("string", "bounds", "inserts", "render", "unknown_handler")
+
+    def __init__(self, translation_candidate: TranslationInstance, n_ids: int):
+        self.string = translation_candidate["string"]
+        self.render = self.string.format
+
+        # (position, min, max, negated) for each condition that can actually fail
+        self.bounds: List[Tuple[int, float, float, bool]] = []
+        for position, condition in enumerate(translation_candidate["condition"][:n_ids]):
+            lower = condition.get("min", -math.inf)
+            upper = condition.get("max", math.inf)
+            if lower == -math.inf and upper == math.inf:
+                continue
+            self.bounds.append((position, lower, upper, condition.get("negated", False)))
+
+        # unknown handlers only raise once the candidate is actually used
+        self.unknown_handler: Optional[str] = None
+        handler_lists = translation_candidate["index_handlers"][:n_ids]
+        for handlers in handler_lists:
+            for handler in handlers:
+                if handler not in INDEX_HANDLERS and self.unknown_handler is None:
+                    self.unknown_handler = handler
+
+        # (position, prefix, handler pipeline) for each value that is inserted into the string
+        self.inserts: List[Tuple[int, str, Optional[Callable[[float], float]]]] = []
+        if self.unknown_handler is None:
+            for position, (format, handlers) in enumerate(zip(translation_candidate["format"], handler_lists)):
+                if format in FORMAT_PREFIXES:
+                    self.inserts.append((position, FORMAT_PREFIXES[format], _compose_index_handlers(handlers)))
+
+    def satisfies_conditions(self, values: List[float]) -> bool:
+        for position, lower, upper, negated in self.bounds:
+            if not lower <= values[position] <= upper:
+                return negated
+        return True
+
+    def translate(
+        self, min_max_tuples: List[Tuple[float, float]], translate_range: Callable[[Tuple[float, float]], str]
+    ) -> str:
+        if self.unknown_handler is not None:
+            raise ValueError(f"Unknown index handler {self.unknown_handler}")
+        if not self.inserts:
+            return self.string
+        inserts = []
+        for position, prefix, pipeline in self.inserts:
+            minimum, maximum = min_max_tuples[position]
+            if pipeline is not None:
+                minimum, maximum = pipeline(minimum), pipeline(maximum)
+            inserts.append(prefix + translate_range((minimum, maximum)))
+        return self.render(*inserts)
+
+
+class TranslationCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
 
 class Translator:
     # class for translating stats from the game to human readable format    
 
-    def __init__(self, translation_table: List[StatTranslation] = stat_translations, translate_range: Optional[Callable[[Tuple[float, float]], str]] = None):
+    def __init__(
+        self,
+        translation_table: Optional[List[StatTranslation]] = None,
+        translate_range: Optional[Callable[[Tuple[float, float]], str]] = None,
+        cache_size: Optional[int] = None,
+    ):
+        # defaults to RePoE.stat_translations, which is only loaded once a Translator is created
+        self._uses_default_table = translation_table is None
+        if translation_table is None:
+            translation_table = RePoE.stat_translations
         self._translation_table = translation_table
+        self._stat_index = self._build_stat_index(translation_table)
+        self._compiled_table = self._compile_translation_table(translation_table)
         if translate_range is not None:
             self._translate_range = translate_range
         else:
             self._translate_range = self._translate_range_default
 
+        # optional LRU cache of translated stats, keyed on the stat ids and their value ranges
+        if cache_size is not None and cache_size <= 0:
+            raise ValueError(f"cache_size should be a positive number, not {cache_size}")
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[frozenset, List[str]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+
+    def cache_info(self) -> TranslationCacheInfo:
+        with self._cache_lock:
+            return TranslationCacheInfo(
+                self._cache_hits, self._cache_misses, self._cache_evictions, self._cache_size or 0, len(self._cache)
+            )
+
+    def cache_clear(self):
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_hits = 0
+            self._cache_misses = 0
+            self._cache_evictions = 0
+
+
+    @staticmethod
+    def _build_stat_index(translation_table: List[StatTranslation]) -> Dict[str, List[int]]:
+        # maps each stat id to the positions of all translations that mention it
+        stat_index: Dict[str, List[int]] = {}
+        for position, translation in enumerate(translation_table):
+            for stat_id in translation["ids"]:
+                positions = stat_index.setdefault(stat_id, [])
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+        return stat_index
+
+    @staticmethod
+    def _compile_translation_table(
+        translation_table: List[StatTranslation],
+    ) -> List[Tuple[List[str], List[CompiledTranslation]]]:
+        return [
+            (
+                translation["ids"],
+                [CompiledTranslation(candidate, len(translation["ids"])) for candidate in translation["English"]],
+            )
+            for translation in translation_table
+        ]
 
     @staticmethod
     def _translate_range_default(minmaxtuple: Tuple[float, float]) -> str:
@@ -35,181 +290,114 @@ class Translator:
         raise ValueError(f"Stat {stat} has no value or min/max")
 
 
-    @staticmethod
-    def _satisfies_conditions(conditions: List[TranslationCondition], values: List[float]) -> bool:
-        for condition, value in zip(conditions, values):
-            if condition == {}:
-                continue            
-            if not condition.get("min", -math.inf) <= value <= condition.get("max", math.inf):
-                return False if not condition.get("negated") else True
-        return True
-    
-
-    @staticmethod
-    def _apply_index_handler_to_value(value: float, handler:str):
-        match handler:
-            case "divide_by_twenty":
-                return value / 20
-            case "divide_by_fifteen_0dp":
-                return value // 15
-            case "times_one_point_five":
-                return value * 1.5
-            case "mod_value_to_item_class":
-                return value
-            case "weapon_tree_unique_base_type_name":
-                # Reward from selling a crucible weapon with a weapon tree reward node
-                return value
-            case "display_indexable_skill":
-                # Replica Dragonfang. No idea how to map values to skills
-                return value
-            case "locations_to_metres":
-                return round(value / 10, 1)
-            case "divide_by_one_thousand":
-                return value / 1000
-            case "tree_expansion_jewel_passive":
-                # not sure how to handle this
-                return value
-            case "divide_by_twenty_then_double_0dp":
-                return value // 10
-            case "milliseconds_to_seconds_0dp":
-                return value // 1000
-            case "multiplicative_damage_modifier":
-                # only one weird case so ignoring
-                return value
-            case "divide_by_ten_0dp":
-                return value // 10
-            case "divide_by_two_0dp":
-                return value // 2
-            case "divide_by_ten_1dp":
-                return round(value / 10, 1)
-            case "divide_by_ten_1dp_if_required":
-                return round(value / 10, 1)
-            case "divide_by_one_hundred_2dp":
-                return round(value / 100, 2)
-            case "per_minute_to_per_second_2dp_if_required":
-                return round(value / 60, 2)
-            case "30%_of_value":
-                return value * 0.3
-            case "deciseconds_to_seconds":
-                return value / 10
-            case "old_leech_permyriad":
-                return value / 10000
-            case "divide_by_four":
-                return value / 4
-            case "60%_of_value":
-                return value * 0.6
-            case "divide_by_one_hundred_2dp_if_required":
-                return round(value / 100, 2)
-            case "milliseconds_to_seconds":
-                return value / 1000
-            case "negate":
-                return -value
-            case "canonical_stat":
-                return value
-            case "divide_by_twelve":
-                return value / 12
-            case "times_twenty":
-                return value * 20
-            case "divide_by_six":
-                return value / 6
-            case "divide_by_fifty":
-                return value / 50
-            case "display_indexable_support":
-                # Forbidden Shako. No idea how to map values to supports
-                return value
-            case "per_minute_to_per_second_0dp":
-                return math.floor(value / 60)
-            case "divide_by_one_hundred_and_negate":
-                return -value / 100
-            case "per_minute_to_per_second_1dp":
-                return round(value / 60, 1)
-            case "milliseconds_to_seconds_1dp":
-                return round(value / 1000, 1)
-            case "per_minute_to_per_second_2dp":
-                return round(value / 60, 2)
-            case "plus_two_hundred":
-                return value + 200
-            case "divide_by_three":
-                return value / 3
-            case "per_minute_to_per_second":
-                return value / 60
-            case "old_leech_percent":
-                return value / 100
-            case "divide_by_five":
-                return value / 5
-            case "milliseconds_to_seconds_2dp_if_required":
-                return round(value / 1000, 2)
-            case "divide_by_one_hundred":
-                return value / 100
-            case "affliction_reward_type":
-                # delirium rewards. No idea how to map values to rewards
-                return value
-            case "passive_hash":
-                # not sure how to handle this
-                return value
-            case "negate_and_double":
-                return -value * 2
-            case "double":
-                return value * 2
-            case _:
-                raise ValueError(f"Unknown index handler {handler}")
-
     @staticmethod
     def _get_max_value(stat: dict) -> float:
         return stat["value"] if "value" in stat else stat["max"]
 
-    def _format_values(self, format_list: List[Literal['ignore', '#', '+#']], value_list: List[List[float]]) -> List[str]:
-        formatted_values = []
-        for format, values in zip(format_list, value_list):
-            value_string = self._translate_range((values[0], values[1]))
-            if format == "ignore":
-                continue
-            if format == "#":
-                formatted_values.append(value_string)
-            if format == "+#":
-                formatted_values.append(f"+{value_string}")
-        return formatted_values
-        
-
-    def translate_stats(self, stats: Union[List, Dict]) -> List[str]:
-        translated_stats = []
+    def _to_stat_dict(self, stats: Union[List, Dict]) -> Dict[str, Tuple[float, float]]:
         if isinstance(stats, list):
-            stat_dict = {stat["id"]: self._get_min_max(stat) for stat in stats}
+            return {stat["id"]: self._get_min_max(stat) for stat in stats}
         elif isinstance(stats, dict):
-            stat_dict = {stat_id: (value, value) for stat_id, value in stats.items()}
+            return {stat_id: (value, value) for stat_id, value in stats.items()}
         else:
             raise ValueError(f"stats should be a list or dict, not {type(stats)}")
-        
+
+    @staticmethod
+    def _get_cache_key(stat_dict: Dict[str, Tuple[float, float]]) -> frozenset:
+        # 10 and 10.0 are equal but are displayed differently, so the types of the values are part of the key
+        return frozenset(
+            (stat_id, type(minimum), minimum, type(maximum), maximum)
+            for stat_id, (minimum, maximum) in stat_dict.items()
+        )
+
+    def translate_stats(self, stats: Union[List, Dict]) -> List[str]:
+        return self._translate_cached(self._to_stat_dict(stats))
+
+    def _translate_cached(self, stat_dict: Dict[str, Tuple[float, float]]) -> List[str]:
+        if self._cache_size is None:
+            return self._translate_stat_dict(stat_dict)
+
+        key = self._get_cache_key(stat_dict)
+        with self._cache_lock:
+            translated_stats = self._cache.get(key)
+            if translated_stats is not None:
+                self._cache.move_to_end(key)
+                self._cache_hits += 1
+                return list(translated_stats)
+            self._cache_misses += 1
+
+        translated_stats = self._translate_stat_dict(stat_dict)
+        with self._cache_lock:
+            self._cache[key] = translated_stats
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+                self._cache_evictions += 1
+        return list(translated_stats)
+
+    def translate_many(
+        self, stats_iterable: Iterable[Union[List, Dict]], processes: Optional[int] = None, chunksize: int = 2000
+    ) -> List[List[str]]:
+        # translates a whole collection of stat lists/dicts, e.g. (mod["stats"] for mod in mods.values())
+        # identical inputs are only translated once. if processes is given, batches larger than chunksize are
+        # split across a process pool, a custom translate_range then has to be picklable
+        stat_dicts = [self._to_stat_dict(stats) for stats in stats_iterable]
+
+        unique_positions: Dict[frozenset, int] = {}
+        unique_stat_dicts: List[Dict[str, Tuple[float, float]]] = []
+        input_positions = []
+        for stat_dict in stat_dicts:
+            key = self._get_cache_key(stat_dict)
+            if key not in unique_positions:
+                unique_positions[key] = len(unique_stat_dicts)
+                unique_stat_dicts.append(stat_dict)
+            input_positions.append(unique_positions[key])
+
+        if processes is not None and len(unique_stat_dicts) > chunksize:
+            results = self._translate_in_pool(unique_stat_dicts, processes, chunksize)
+        else:
+            results = [self._translate_cached(stat_dict) for stat_dict in unique_stat_dicts]
+
+        return [list(results[position]) for position in input_positions]
+
+    def _translate_in_pool(
+        self, stat_dicts: List[Dict[str, Tuple[float, float]]], processes: int, chunksize: int
+    ) -> List[List[str]]:
+        # workers build their own Translator, the default table is loaded by the workers instead of being pickled
+        translation_table = None if self._uses_default_table else self._translation_table
+        translate_range = None if self._translate_range == self._translate_range_default else self._translate_range
+        chunks = [stat_dicts[i : i + chunksize] for i in range(0, len(stat_dicts), chunksize)]
+        results = []
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_translation_worker,
+            initargs=(translation_table, translate_range),
+        ) as executor:
+            for chunk_result in executor.map(_translate_chunk, chunks):
+                results.extend(chunk_result)
+        return results
+
+    def _translate_stat_dict(self, stat_dict: Dict[str, Tuple[float, float]]) -> List[str]:
+        translated_stats = []
         untranslated_stats = set(stat_dict.keys())
-        
-        for translation in self._translation_table:
-            stat_intersection = set(translation["ids"]).intersection(untranslated_stats)
-
-
-
-            if stat_intersection:
-                values = [stat_dict[stat_id][1] if stat_id in stat_dict else 0 for stat_id in translation["ids"]]
-                min_max_tuples = [stat_dict[stat_id] if stat_id in stat_dict else (0, 0) for stat_id in translation["ids"]]
-
-                for translation_candidate in translation["English"]:
-                    if self._satisfies_conditions(translation_candidate["condition"], values):
-                        handled_values: List[List[float]] = [ ]	
-                        for minmax, handlers in zip(min_max_tuples, translation_candidate["index_handlers"]):
-                            if minmax is None:
-                                continue
-                            handled_min_max_pair = []
-                            for value in minmax:
-                                for handler in handlers:
-                                    value = self._apply_index_handler_to_value(value, handler)
-                                handled_min_max_pair.append(value)
-                            handled_values.append(handled_min_max_pair)
-                        inserts = self._format_values(translation_candidate["format"], handled_values)
-                        if not inserts:
-                            translated_stats.append(translation_candidate["string"])
-                        else:
-                            translated_stats.append(translation_candidate["string"].format(*inserts))
-                        untranslated_stats -= set(translation["ids"])
-                        break
+
+        # only translations that mention one of the given stats need to be visited,
+        # sorting keeps the order of the translation table
+        candidate_positions = sorted(
+            {position for stat_id in stat_dict for position in self._stat_index.get(stat_id, ())}
+        )
+        for position in candidate_positions:
+            ids, compiled_candidates = self._compiled_table[position]
+            if untranslated_stats.isdisjoint(ids):
+                continue
+
+            values = [stat_dict[stat_id][1] if stat_id in stat_dict else 0 for stat_id in ids]
+            for compiled_candidate in compiled_candidates:
+                if compiled_candidate.satisfies_conditions(values):
+                    min_max_tuples = [stat_dict[stat_id] if stat_id in stat_dict else (0, 0) for stat_id in ids]
+                    translated_stats.append(compiled_candidate.translate(min_max_tuples, self._translate_range))
+                    untranslated_stats.difference_update(ids)
+                    break
             if not untranslated_stats:
                 break
         if untranslated_stats:
@@ -218,6 +406,194 @@ class Translator:
         return translated_stats
 
 
+_worker_translator: Optional[Translator] = None
+
+
+def _init_translation_worker(
+    translation_table: Optional[List[StatTranslation]],
+    translate_range: Optional[Callable[[Tuple[float, float]], str]],
+):
+    global _worker_translator
+    _worker_translator = Translator(translation_table, translate_range)
+
+
+def _translate_chunk(stat_dicts: List[Dict[str, Tuple[float, float]]]) -> List[List[str]]:
+    return [_worker_translator._translate_stat_dict(stat_dict) for stat_dict in stat_dicts]
+
+
+# a displayed value, either a single number or a range like (20-30)
+_NUMBER_PATTERN = r"-?\d+(?:\.\d+)?"
+_VALUE_PATTERN = rf"\(({_NUMBER_PATTERN})(?:-|–|—| to )({_NUMBER_PATTERN})\)|({_NUMBER_PATTERN})"
+_VALUE_REGEX = re.compile(rf"[+-]*(?:\(-?\d+(?:\.\d+)?(?:-|–|—| to )-?\d+(?:\.\d+)?\)|\d+(?:\.\d+)?)")
+
+
+def _get_skeleton(text: str) -> str:
+    # replaces every displayed value with "#", so a line and the translation it came from share the same skeleton
+    return _VALUE_REGEX.sub("#", text)
+
+
+class ReverseCandidate:
+    # a translation candidate that can be matched against displayed text
+
+    __slots__ = ("ids", "compiled", "preceding", "pattern", "fields", "inverse_handlers", "_regex")
+
+    def __init__(
+        self,
+        ids: List[str],
+        compiled: CompiledTranslation,
+        handlers: List[List[str]],
+        preceding: Sequence[CompiledTranslation] = (),
+    ):
+        self.ids = ids
+        self.compiled = compiled
+        # the candidates before this one in its translation, Translator uses the first one whose conditions are met
+        self.preceding = preceding
+        self._regex: Optional[re.Pattern] = None
+
+        # builds the pattern from the literal parts of the string, fields are replaced by value groups
+        pattern_parts = []
+        # stat position for each field in the string, in the order the fields appear
+        self.fields: List[int] = []
+        for literal, field, _, _ in string.Formatter().parse(compiled.string):
+            pattern_parts.append(re.escape(literal))
+            if field is None:
+                continue
+            position, prefix, _ = compiled.inserts[int(field)]
+            if prefix:
+                pattern_parts.append(rf"{re.escape(prefix)}?")
+            pattern_parts.append(rf"(?:{_VALUE_PATTERN})")
+            self.fields.append(position)
+        self.pattern = "".join(pattern_parts)
+
+        self.inverse_handlers: Dict[int, List[Callable[[float], float]]] = {
+            position: [INVERSE_INDEX_HANDLERS[handler] for handler in reversed(handlers[position])]
+            for position in set(self.fields)
+        }
+
+    @property
+    def skeleton(self) -> str:
+        # renders the string with a placeholder value for each field
+        inserts = [prefix + "1" for _, prefix, _ in self.compiled.inserts]
+        return _get_skeleton(self.compiled.render(*inserts) if inserts else self.compiled.string)
+
+    @property
+    def regex(self) -> re.Pattern:
+        # most candidates are never matched, so the regex is only compiled on first use
+        if self._regex is None:
+            self._regex = re.compile(self.pattern)
+        return self._regex
+
+    def _to_stat_value(self, position: int, value: str) -> float:
+        stat_value = float(value)
+        for inverse_handler in self.inverse_handlers[position]:
+            stat_value = inverse_handler(stat_value)
+        # stat values are integers, handlers that round can not be inverted exactly
+        return int(round(stat_value))
+
+    def match(self, line: str) -> Optional[List[ModStat]]:
+        match = self.regex.fullmatch(line)
+        if match is None:
+            return None
+
+        values: Dict[int, Tuple[float, float]] = {}
+        groups = match.groups()
+        for field, position in enumerate(self.fields):
+            range_min, range_max, single = groups[3 * field : 3 * field + 3]
+            if single is not None:
+                minimum = maximum = self._to_stat_value(position, single)
+            else:
+                minimum = self._to_stat_value(position, range_min)
+                maximum = self._to_stat_value(position, range_max)
+            if minimum > maximum:
+                minimum, maximum = maximum, minimum
+            values[position] = (minimum, maximum)
+
+        # values that are not displayed are filled in from their conditions
+        for position in range(len(self.ids)):
+            if position not in values:
+                value = self._get_hidden_value(position)
+                values[position] = (value, value)
+
+        # conditions are checked on the maximum, same as Translator, so only lines it would produce are matched
+        maximums = [values[position][1] for position in range(len(self.ids))]
+        if not self.compiled.satisfies_conditions(maximums):
+            return None
+        if any(preceding.satisfies_conditions(maximums) for preceding in self.preceding):
+            return None
+
+        return [
+            {"id": self.ids[position], "min": values[position][0], "max": values[position][1]}
+            for position in range(len(self.ids))
+        ]
+
+    def _get_hidden_value(self, position: int) -> float:
+        # the lower bound of the condition of the value, 1 if it has none
+        for bound_position, lower, upper, negated in self.compiled.bounds:
+            if bound_position != position:
+                continue
+            if negated:
+                # any value outside of the bounds
+                return lower - 1 if lower != -math.inf else upper + 1
+            return lower if lower != -math.inf else upper
+        return 1
+
+
+class ReverseTranslator:
+    # class for translating human readable stat lines back to stat ids and values, the inverse of Translator.
+    # several translations can produce the same line, e.g. "15% increased Movement Speed" is produced by the
+    # generic movement speed stat as well as by stats like from_armour_movement_speed_+%. translate_line returns the
+    # translation with the fewest stats, the first one in the table if there are several, and translate_line_all
+    # returns all of them in that order
+
+    def __init__(self, translation_table: Optional[List[StatTranslation]] = None):
+        if translation_table is None:
+            translation_table = RePoE.stat_translations
+        # candidates are grouped by the skeleton of their string, so a line only has to be matched against
+        # the few candidates that share its skeleton
+        self._skeleton_index: Dict[str, List[ReverseCandidate]] = {}
+        for translation in translation_table:
+            ids = translation["ids"]
+            compiled_candidates = [CompiledTranslation(candidate, len(ids)) for candidate in translation["English"]]
+            for position, (candidate, compiled) in enumerate(zip(translation["English"], compiled_candidates)):
+                if compiled.unknown_handler is not None:
+                    continue
+                handlers = candidate["index_handlers"]
+                if any(handler not in INVERSE_INDEX_HANDLERS for handler_list in handlers for handler in handler_list):
+                    continue
+                try:
+                    reverse_candidate = ReverseCandidate(ids, compiled, handlers, compiled_candidates[:position])
+                    skeleton = reverse_candidate.skeleton
+                except (IndexError, ValueError):
+                    # strings that reference values which are not displayed can not be translated either way
+                    continue
+                self._skeleton_index.setdefault(skeleton, []).append(reverse_candidate)
+        # candidates are added in table order and the sort is stable, so candidates with the same number of stats
+        # stay in table order
+        for candidates in self._skeleton_index.values():
+            candidates.sort(key=lambda reverse_candidate: len(reverse_candidate.ids))
+
+    def translate_line_all(self, line: str) -> List[List[ModStat]]:
+        # returns the stats of every translation that produces the given line, the preferred one first
+        line = line.strip()
+        matches = []
+        for candidate in self._skeleton_index.get(_get_skeleton(line), ()):
+            stats = candidate.match(line)
+            if stats is not None and stats not in matches:
+                matches.append(stats)
+        return matches
+
+    def translate_line(self, line: str) -> Optional[List[ModStat]]:
+        # returns the stats that produce the given line, or None if no translation matches
+        line = line.strip()
+        for candidate in self._skeleton_index.get(_get_skeleton(line), ()):
+            stats = candidate.match(line)
+            if stats is not None:
+                return stats
+        return None
+
+    def translate_lines(self, lines: Iterable[str]) -> List[Optional[List[ModStat]]]:
+        return [self.translate_line(line) for line in lines]
+
 
 if __name__ == "__main__":
     import RePoE
@@ -1,9 +1,24 @@
+import hashlib
 import json
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 from RePoE import __REPOE_DIR__
 
+# the wiki that is queried, can be pointed to another server (e.g. a local copy) with the REPOE_WIKI_URL environment
+# variable or the wiki_url argument of WikiClient
+DEFAULT_WIKI_URL = "https://www.poewiki.net/"
+WIKI_URL_ENV = "REPOE_WIKI_URL"
+# responses are kept here and revalidated with their ETag/Last-Modified headers, so unchanged pages are not downloaded
+# again. Set REPOE_WIKI_CACHE_DIR to use another folder
+WIKI_CACHE_DIR_ENV = "REPOE_WIKI_CACHE_DIR"
+DEFAULT_WIKI_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "RePoE", "wiki")
+# one connection per table that is fetched at the same time
+MAX_CONNECTIONS = 5
+
 
 def save_file(file_name, data):
     with open(os.path.join(__REPOE_DIR__, "wikidata", file_name + ".min.json"), "w") as f:
@@ -12,11 +27,70 @@ def save_file(file_name, data):
         f.write(json.dumps(data, indent=2, sort_keys=True))
 
 
-def request_data_from_wiki(tables: list[str], fields: list[str], where: str = "", join_on: str = ""):
+class WikiClient:
+    """pooled (and retrying) connections to the wiki with an on-disk response cache, safe to share between threads"""
+
+    def __init__(self, wiki_url: Optional[str] = None, cache_dir: Optional[str] = None, use_cache: bool = True):
+        self.wiki_url = wiki_url or os.environ.get(WIKI_URL_ENV) or DEFAULT_WIKI_URL
+        if not self.wiki_url.endswith("/"):
+            self.wiki_url += "/"
+        self.cache_dir = None
+        if use_cache:
+            self.cache_dir = cache_dir or os.environ.get(WIKI_CACHE_DIR_ENV) or DEFAULT_WIKI_CACHE_DIR
+        self.session = requests.Session()
+        # the wiki answers with 429 when it is queried too often, Retry waits as long as its Retry-After header says
+        retry = Retry(total=5, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=MAX_CONNECTIONS, pool_maxsize=MAX_CONNECTIONS, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _get_cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def _load_cached(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._get_cache_path(url)) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cached if cached.get("url") == url else None
+
+    def _store_cached(self, url: str, response: requests.Response):
+        validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        # without a validator the page could never be revalidated, so there is no point in keeping it
+        if not any(validators.values()):
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_path = self._get_cache_path(url)
+        with open(cache_path + ".tmp", "w") as f:
+            json.dump({"url": url, "body": response.text, **validators}, f)
+        os.replace(cache_path + ".tmp", cache_path)
+
+    def get_json(self, url: str):
+        cached = self._load_cached(url) if self.cache_dir else None
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        response = self.session.get(url, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            return json.loads(cached["body"])
+        response.raise_for_status()
+        if self.cache_dir:
+            self._store_cached(url, response)
+        return response.json()
+
+
+def request_data_from_wiki(
+    tables: list[str], fields: list[str], where: str = "", join_on: str = "", client: Optional[WikiClient] = None
+):
+    client = client or WikiClient()
     items = []
     offset = 0
     while True:
-        url = "https://www.poewiki.net/w/api.php?action=cargoquery"
+        url = client.wiki_url + "w/api.php?action=cargoquery"
         url += f"&tables={','.join(tables)}"
         url += f"&fields={','.join(fields)}"
         if where:
@@ -26,8 +100,7 @@ def request_data_from_wiki(tables: list[str], fields: list[str], where: str = ""
         url += f"&limit=500"
         url += f"&offset={offset}"
         url += "&format=json"
-        response = requests.get(url)
-        results = response.json()["cargoquery"]
+        results = client.get_json(url)["cargoquery"]
         items.extend(map_item(result["title"]) for result in results)
         if len(results) < 500:
             break
@@ -88,63 +161,66 @@ def map_item(item):
     return {key.replace(" ", "_"): parameter_mapping(key, value) for key, value in item.items()}
 
 
-def fetch_unique_items():
+def fetch_unique_items(client: Optional[WikiClient] = None):
     table = "items"
     fields = ["name", "class_id", "base_item", "is_drop_restricted", "tags", "drop_text",
               "drop_enabled", "drop_monsters", "drop_areas", "explicit_stat_text", "acquisition_tags", "inventory_icon"]
     where = "rarity=%22Unique%22"
-    data = request_data_from_wiki([table], fields, where, "")
+    data = request_data_from_wiki([table], fields, where, "", client)
 
     for item in data:
-        item["icon_url"] = "https://www.poewiki.net/wiki/" + \
+        item["icon_url"] = DEFAULT_WIKI_URL + "wiki/" + \
             item["name"].replace(" ", "_") + \
             "#/media/" + \
             item.pop("inventory_icon").replace(" ", "_")
     save_file("unique_items", data)
 
 
-def fetch_areas():
+def fetch_areas(client: Optional[WikiClient] = None):
     fields = ["name", "area_level", "boss_monster_ids", "tags", "id"]
     table = "areas"
     where = "is_map_area=1"
-    data = request_data_from_wiki([table], fields, where, "")
+    data = request_data_from_wiki([table], fields, where, "", client)
     save_file("areas", data)
 
 
-def fetch_unique_monsters():
+def fetch_unique_monsters(client: Optional[WikiClient] = None):
     fields = ["name", "metadata_id"]
     table = "monsters"
     where = "rarity=%22Unique%22"
-    data = request_data_from_wiki([table], fields, where, "")
+    data = request_data_from_wiki([table], fields, where, "", client)
     save_file("unique_monsters", data)
 
 
-def fetch_current_atlas_maps():
+def fetch_current_atlas_maps(client: Optional[WikiClient] = None):
     tables = ["maps", "areas"]
     fields = ["areas.name", "maps.tier"]
     where = "areas.is_map_area AND maps.tier > 0 AND maps.series=\"Necropolis\" AND areas.name != \"The Shaper's Realm\""
     join_on = "areas.id = maps.area_id"
-    data = request_data_from_wiki(tables, fields, where, join_on)
+    data = request_data_from_wiki(tables, fields, where, join_on, client)
     save_file("atlas_maps", data)
 
 
-def fetch_base_items():
+def fetch_base_items(client: Optional[WikiClient] = None):
     fields = ["name", "class_id", "base_item",
               "is_drop_restricted", "drop_enabled", "tags"]
     table = "items"
     unneeded_classids = ["Microtransaction", "HideoutDoodad", "QuestItem"]
     where = "rarity=%22Normal%22 AND class_id NOT IN ('" + "','".join(
         unneeded_classids) + "') "
-    data = request_data_from_wiki([table], fields, where, "")
+    data = request_data_from_wiki([table], fields, where, "", client)
     save_file("base_items", data)
 
 
-def fetch_wiki_data():
-    fetch_unique_items()
-    fetch_unique_monsters()
-    fetch_areas()
-    fetch_current_atlas_maps()
-    fetch_base_items()
+def fetch_wiki_data(wiki_url: Optional[str] = None, cache_dir: Optional[str] = None):
+    # the tables are independent of each other, so they are fetched at the same time over one connection pool
+    client = WikiClient(wiki_url, cache_dir)
+    fetches = [fetch_unique_items, fetch_unique_monsters, fetch_areas, fetch_current_atlas_maps, fetch_base_items]
+    with ThreadPoolExecutor(MAX_CONNECTIONS) as executor:
+        futures = [executor.submit(fetch, client) for fetch in fetches]
+        for future in futures:
+            # raises the exception of a failed fetch
+            future.result()
 
 
 if __name__ == "__main__":
@@ -3,22 +3,49 @@ import os
 from typing import Dict, List
 
 from RePoE.poe_types import *
+from RePoE.snapshot import load_json_file
 # directory that this __init__ file lives in
 __REPOE_DIR__, _ = os.path.split(__file__)
 
 
 def load_json(json_file_path: str):
     file_path = os.path.join(__REPOE_DIR__, json_file_path)
-    with open(file_path) as json_data:
-        try:
-            return json.load(json_data)
-        except json.decoder.JSONDecodeError:
-            raise Exception(
-                f"Warning: {json_file_path} failed to decode json \n Recommended to reinstall RePoE")
-
-
-unique_items: List[UniqueItem] = load_json("unique_items.min.json")
-unique_monsters: Dict[str, str] = load_json("unique_monsters.min.json")
-areas: List[Area] = load_json("areas.min.json")
-maps: List[Map] = load_json("atlas_maps.min.json")
-base_items: List[WikiBaseItem] = load_json("base_items.min.json")
+    try:
+        return load_json_file(file_path)
+    except json.decoder.JSONDecodeError:
+        raise Exception(
+            f"Warning: {json_file_path} failed to decode json \n Recommended to reinstall RePoE")
+
+
+# datasets are only loaded the first time they are accessed, see __getattr__ below
+_DATASET_FILES: Dict[str, str] = {
+    "unique_items": "unique_items.min.json",
+    "unique_monsters": "unique_monsters.min.json",
+    "areas": "areas.min.json",
+    "maps": "atlas_maps.min.json",
+    "base_items": "base_items.min.json",
+}
+
+unique_items: List[UniqueItem]
+unique_monsters: Dict[str, str]
+areas: List[Area]
+maps: List[Map]
+base_items: List[WikiBaseItem]
+
+# a reload has to drop the datasets that were loaded before, so they are read again
+for _dataset_name in _DATASET_FILES:
+    globals().pop(_dataset_name, None)
+
+# lists the datasets for star imports, as in RePoE/__init__.py
+__all__ = sorted({name for name in globals() if not name.startswith("_")} | set(_DATASET_FILES))
+
+
+def __getattr__(name: str):
+    if name in _DATASET_FILES:
+        data = globals()[name] = load_json(_DATASET_FILES[name])
+        return data
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_DATASET_FILES))
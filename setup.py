@@ -17,6 +17,8 @@ REQUIRED = []
 # What packages are optional?
 EXTRAS = {
     # 'fancy feature': ['django'],
+    # RePoE.crafting_simulator and RePoE.fossil_weights
+    "crafting": ["numpy"],
 }
 # traverse RePoE/data and add all files to data_files
 data_files = []
@@ -44,7 +46,17 @@ setup(
     author_email=EMAIL,
     python_requires=REQUIRES_PYTHON,
     url=URL,
-    py_modules=["RePoE.poe_types", "RePoE.util", "RePoE.wikidata.__init__"],
+    py_modules=[
+        "RePoE.poe_types",
+        "RePoE.util",
+        "RePoE.snapshot",
+        "RePoE.stat_translation_files",
+        "RePoE.mod_pool",
+        "RePoE.crafting_simulator",
+        "RePoE.fossil_weights",
+        "RePoE.mod_tiers",
+        "RePoE.wikidata.__init__",
+    ],
     install_requires=REQUIRED,
     extras_require=EXTRAS,
     license="proprietary",